@@ -0,0 +1,231 @@
+"""
+[신규] 여러 제품(강종)의 시험 결과를 한 번에 통합하는 명령줄 배치 실행
+
+Streamlit을 불러오지 않으므로 스케줄러 서버에서도 빠르게 시작합니다.
+파일 묶음(양식, 성분, 인장, 충격)마다 결과 파일을 하나씩 만들고,
+묶음들은 프로세스 풀에서 동시에 처리한 뒤 소요 시간과 실패 목록을 출력합니다.
+
+실행 예:
+    python batch.py 입력폴더 --output-dir 결과폴더
+    python batch.py manifest.json --workers 4 --summary summary.json
+    python batch.py 입력폴더 --out-of-core --workers 1   (여러 해 재통합처럼 입력이 메모리보다 클 때)
+
+입력 폴더 규칙:
+    '<제품명> 성분시험결과.xlsx', '<제품명> 인장시험결과.xlsx', '<제품명> 충격시험결과.xlsx'를
+    한 묶음으로 보며, 양식은 '<제품명> 양식.xlsx'가 있으면 그 파일, 없으면 폴더의 공용 양식
+    (이름에 '양식'이 들어간 파일)을 사용합니다.
+    '<제품명> 성분시험결과 2024-01.xlsx'처럼 뒤에 붙은 이름이 다른 여러 파일은
+    파일 이름 순서대로 합칩니다 (파일 간 중복 행은 한 번만 사용).
+
+목록 파일(.json 또는 .csv) 규칙:
+    묶음마다 name, template, component, tensile, impact, output(선택) 항목을 가집니다.
+    상대 경로는 목록 파일이 있는 폴더를 기준으로 합니다.
+    component, tensile, impact는 여러 파일도 가능합니다 (JSON은 목록, CSV는 ';'로 구분).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from data_processing import (
+    TEST_KINDS, PipelineProfile, assemble_final_dataframe,
+    collect_errors, consolidate_out_of_core, load_template_workbook, read_and_process_all, run_in_parallel,
+    write_data_to_excel, write_data_to_excel_streaming,
+)
+
+# --- 설정 부분 ---
+BATCH_CONFIG = {
+    # 입력 폴더에서 시험 종류를 구분하는 파일 이름 끝부분
+    "file_suffixes": {
+        "component": "성분시험결과",
+        "tensile": "인장시험결과",
+        "impact": "충격시험결과",
+    },
+    # 양식 파일 이름에 들어가는 단어
+    "template_keyword": "양식",
+    # 결과 파일 이름 (앞에 제품명이 붙음)
+    "output_suffix": "통합_시험_결과_완성본.xlsx",
+}
+
+
+def find_file_sets(input_dir, output_dir):
+    """입력 폴더에서 제품별 파일 묶음 목록을 찾는 함수"""
+    suffixes = BATCH_CONFIG['file_suffixes']
+    keyword = BATCH_CONFIG['template_keyword']
+    names = sorted(name for name in os.listdir(input_dir)
+                   if name.endswith('.xlsx') and not name.startswith('~$'))
+
+    shared_templates = [name for name in names if keyword in name]
+    file_sets = {}
+    for name in names:
+        stem = os.path.splitext(name)[0]
+        for kind, suffix in suffixes.items():
+            if suffix in stem:
+                # [수정] 시험 종류 뒤에 붙은 이름(기간 등)이 다른 파일은 같은 묶음의 여러 파일
+                product = stem.split(suffix)[0].strip()
+                file_sets.setdefault(product, {}).setdefault(kind, []).append(os.path.join(input_dir, name))
+
+    results = []
+    for product, files in sorted(file_sets.items()):
+        own_template = [name for name in shared_templates if name.startswith(product) and product]
+        templates = own_template or shared_templates
+        file_set = {
+            'name': product,
+            'template': os.path.join(input_dir, templates[0]) if templates else None,
+            **{kind: files.get(kind) for kind in TEST_KINDS},
+        }
+        file_set['output'] = os.path.join(output_dir, f"{product} {BATCH_CONFIG['output_suffix']}".strip())
+        results.append(file_set)
+    return results
+
+
+def load_manifest(path, output_dir):
+    """목록 파일(.json 또는 .csv)에서 파일 묶음 목록을 읽는 함수"""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            entries = list(csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    results = []
+    for number, entry in enumerate(entries, 1):
+        name = entry.get('name') or f'묶음{number}'
+        file_set = {'name': name}
+        file_set['template'] = os.path.join(base_dir, entry['template']) if entry.get('template') else None
+        for kind in TEST_KINDS:
+            value = entry.get(kind) or []
+            if isinstance(value, str):
+                value = [part.strip() for part in value.split(';') if part.strip()]
+            file_set[kind] = [os.path.join(base_dir, part) for part in value] or None
+        output = entry.get('output') or f"{name} {BATCH_CONFIG['output_suffix']}"
+        file_set['output'] = output if os.path.isabs(output) else os.path.join(output_dir, output)
+        results.append(file_set)
+    return results
+
+
+def consolidate_file_set(file_set, streaming=False, all_sheets=False, out_of_core=False):
+    """
+    파일 묶음 하나를 통합해 결과 파일을 저장하는 함수 (프로세스 풀 작업 단위)
+    시험 종류별 파일이 여러 개(목록)이면 차례로 합치며, all_sheets=True이면 모든 시트를 읽음
+    [신규] out_of_core=True이면 분할 처리 모드로 통합 (consolidate_out_of_core 참고, 결과는 스트리밍 저장)
+    반환: {'name', 'output', 'ok', 'rows', 'seconds', 'stages', 'errors'}
+    """
+    summary = {'name': file_set['name'], 'output': file_set['output'], 'ok': False,
+               'rows': 0, 'seconds': 0.0, 'stages': [], 'errors': []}
+    started = time.perf_counter()
+    profile = PipelineProfile()
+
+    with collect_errors() as messages:
+        try:
+            missing = [kind for kind in ['template'] + TEST_KINDS if not file_set.get(kind)]
+            if missing:
+                raise ValueError(f"파일 묶음에 {missing} 파일이 없습니다.")
+
+            if out_of_core:
+                # 복합 키 해시 분할 단위로 읽기/처리/쓰기 (분할 하나만 메모리에 올림)
+                os.makedirs(os.path.dirname(os.path.abspath(file_set['output'])), exist_ok=True)
+                output, summary['rows'] = consolidate_out_of_core({kind: file_set[kind] for kind in TEST_KINDS},
+                                                                  file_set['template'], file_set['output'],
+                                                                  all_sheets=all_sheets, profile=profile)
+                if output is None:
+                    raise ValueError("분할 처리에 실패했습니다.")
+                summary['ok'] = True
+            else:
+                # 1-2. 파일 읽기 및 처리 (묶음끼리 병렬로 실행하므로 묶음 안에서는 순차 실행)
+                processed = read_and_process_all({kind: file_set[kind] for kind in TEST_KINDS},
+                                                 max_workers=1, profile=profile, all_sheets=all_sheets)
+                if any(df is None or df.empty for df in processed.values()):
+                    raise ValueError("시험 결과 파일을 읽거나 처리하지 못했습니다.")
+
+                # 3. 데이터 병합 (템플릿 순서의 DataFrame을 바로 생성)
+                with profile.stage('assemble', rows_in=sum(len(df) for df in processed.values())) as record:
+                    final_df_ordered = assemble_final_dataframe(processed['component'], processed['tensile'], processed['impact'])
+                    record['rows_out'] = len(final_df_ordered)
+                summary['rows'] = len(final_df_ordered)
+
+                # 4-5. 결과 파일 쓰기 및 저장
+                os.makedirs(os.path.dirname(os.path.abspath(file_set['output'])), exist_ok=True)
+                if streaming:
+                    with profile.stage('write_save', rows_in=len(final_df_ordered)):
+                        output = write_data_to_excel_streaming(file_set['template'], final_df_ordered, file_set['output'])
+                    if output is None:
+                        raise ValueError("엑셀 파일 쓰기에 실패했습니다.")
+                else:
+                    with profile.stage('write', rows_in=len(final_df_ordered)):
+                        # [수정] 같은 양식을 쓰는 묶음은 작업 프로세스마다 양식을 한 번만 읽고 복제하여 사용
+                        wb = write_data_to_excel(load_template_workbook(file_set['template']), final_df_ordered)
+                    if wb is None:
+                        raise ValueError("엑셀 파일 쓰기에 실패했습니다.")
+                    with profile.stage('save'):
+                        wb.save(file_set['output'])
+                summary['ok'] = True
+        except Exception as e:
+            messages.append(str(e))
+
+    summary['stages'] = profile.records
+    summary['errors'] = list(messages)
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def print_summary(summaries, total_seconds):
+    """묶음별 결과와 소요 시간을 표 형태로 출력하는 함수"""
+    width = max([len(s['name']) for s in summaries] + [4])
+    print(f"{'name':<{width}} | {'result':<6} | {'rows':>8} | {'seconds':>8}")
+    for s in summaries:
+        result = '성공' if s['ok'] else '실패'
+        print(f"{s['name']:<{width}} | {result:<6} | {s['rows']:>8} | {s['seconds']:>8.2f}")
+        for message in s['errors']:
+            print(f"{'':<{width}}   - {message}")
+    failed = sum(not s['ok'] for s in summaries)
+    print(f"--- 전체 {len(summaries)}건, 실패 {failed}건, 소요 시간 {total_seconds:.2f}초 ---")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='여러 제품의 시험 결과를 한 번에 통합하는 배치 실행')
+    parser.add_argument('source', help='입력 폴더 또는 목록 파일(.json, .csv)')
+    parser.add_argument('--output-dir', default=None, help='결과 파일 폴더 (기본: 입력 폴더 또는 목록 파일 폴더)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='동시에 처리할 묶음 수')
+    parser.add_argument('--threads', action='store_true', help='프로세스 대신 스레드 풀 사용')
+    parser.add_argument('--streaming', action='store_true', help='결과를 스트리밍(write-only) 방식으로 저장')
+    parser.add_argument('--all-sheets', action='store_true', help='시험 결과 파일의 모든 시트를 읽어 합침')
+    parser.add_argument('--out-of-core', action='store_true',
+                        help='입력을 복합 키 해시로 나눈 임시 파일을 거쳐 분할 단위로 처리 (메모리보다 큰 입력용)')
+    parser.add_argument('--summary', default=None, help='요약을 저장할 JSON 파일 경로')
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        output_dir = args.output_dir or args.source
+        file_sets = find_file_sets(args.source, output_dir)
+    elif os.path.isfile(args.source):
+        output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.source))
+        file_sets = load_manifest(args.source, output_dir)
+    else:
+        print(f"오류: '{args.source}' 폴더 또는 목록 파일을 찾을 수 없습니다.")
+        return 2
+
+    if not file_sets:
+        print("처리할 파일 묶음이 없습니다.")
+        return 2
+
+    print(f"--- {len(file_sets)}개 파일 묶음 통합을 시작합니다 (동시 처리 {args.workers}개) ---")
+    started = time.perf_counter()
+    summaries = run_in_parallel(consolidate_file_set, [(file_set, args.streaming, args.all_sheets, args.out_of_core)
+                                                        for file_set in file_sets],
+                                max_workers=args.workers, use_processes=not args.threads)
+    total_seconds = time.perf_counter() - started
+    print_summary(summaries, total_seconds)
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'seconds': round(total_seconds, 3), 'file_sets': summaries}, f, ensure_ascii=False, indent=2)
+
+    return 0 if all(s['ok'] for s in summaries) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
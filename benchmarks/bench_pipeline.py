@@ -0,0 +1,146 @@
+"""
+[신규] 통합 파이프라인 단계별 벤치마크
+
+generate_data.py로 만든 행 수별 데이터에 대해 단계(읽기, 성분/인장/충격 처리,
+병합(assemble), 쓰기, 저장)별 소요 시간과 최대 메모리 사용량(tracemalloc 기준)을 기록하고,
+저장해 둔 기준 결과(baseline)와 비교해 느려진 단계를 찾습니다.
+
+- 메모리 측정(tracemalloc)을 켜면 시간도 함께 늘어나므로, 기준 결과와는 같은 옵션으로 비교하세요.
+- 데이터 폴더가 없으면 먼저 생성합니다.
+
+실행 예:
+    python benchmarks/bench_pipeline.py --rows 1000 10000 --save-baseline baseline.json
+    python benchmarks/bench_pipeline.py --rows 1000 10000 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import generate_data  # noqa: E402
+from data_processing import (  # noqa: E402
+    FILENAME_CONFIG, assemble_final_dataframe,
+    process_component_data, process_impact_data, process_tensile_data,
+    load_template_workbook, read_test_data, write_data_to_excel,
+)
+
+
+class StageRecorder:
+    """단계별 소요 시간(초)과 최대 메모리(MB)를 기록하는 클래스"""
+
+    def __init__(self, measure_memory=True):
+        self.measure_memory = measure_memory
+        self.stages = {}
+
+    def run(self, stage, func, *args):
+        if self.measure_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = func(*args)
+        record = {'seconds': round(time.perf_counter() - started, 4)}
+        if self.measure_memory:
+            record['peak_mb'] = round((tracemalloc.get_traced_memory()[1] - base) / 1024 / 1024, 2)
+        self.stages[stage] = record
+        return result
+
+
+def run_pipeline(data_dir, measure_memory=True):
+    """data_dir의 데이터로 파이프라인을 한 번 실행하고 {단계: 기록}을 반환"""
+    recorder = StageRecorder(measure_memory)
+    path = lambda kind: os.path.join(data_dir, FILENAME_CONFIG[kind])  # noqa: E731
+
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        df_comp = recorder.run('read_component', read_test_data, 'component', path('component'))
+        df_tens = recorder.run('read_tensile', read_test_data, 'tensile', path('tensile'))
+        df_impa = recorder.run('read_impact', read_test_data, 'impact', path('impact'))
+
+        processed_comp = recorder.run('process_component', process_component_data, df_comp)
+        processed_tens = recorder.run('process_tensile', process_tensile_data, df_tens)
+        processed_impa = recorder.run('process_impact', process_impact_data, df_impa)
+
+        final_df_ordered = recorder.run('assemble', assemble_final_dataframe, processed_comp, processed_tens, processed_impa)
+
+        wb = recorder.run('template', load_template_workbook, path('template'))
+        wb = recorder.run('write', write_data_to_excel, wb, final_df_ordered)
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder.run('save', wb.save, os.path.join(tmp, FILENAME_CONFIG['output']))
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return {'output_rows': len(final_df_ordered), 'stages': recorder.stages}
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    """기준 결과보다 tolerance 비율 이상(그리고 min_seconds 이상) 느려진 단계 목록을 반환"""
+    regressions = []
+    for rows, result in results.items():
+        base_stages = baseline.get(rows, {}).get('stages', {})
+        for stage, record in result['stages'].items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            slower = record['seconds'] - base['seconds']
+            if slower > min_seconds and record['seconds'] > base['seconds'] * (1 + tolerance):
+                regressions.append((rows, stage, base['seconds'], record['seconds']))
+    return regressions
+
+
+def print_results(results, baseline):
+    print(f"{'rows':>8} | {'stage':<18} | {'seconds':>8} | {'peak MB':>8} | {'baseline':>8}")
+    for rows, result in results.items():
+        base_stages = baseline.get(rows, {}).get('stages', {})
+        for stage, record in result['stages'].items():
+            peak = f"{record['peak_mb']:>8.1f}" if 'peak_mb' in record else f"{'-':>8}"
+            base = f"{base_stages[stage]['seconds']:>8.3f}" if stage in base_stages else f"{'-':>8}"
+            print(f"{rows:>8} | {stage:<18} | {record['seconds']:>8.3f} | {peak} | {base}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='통합 파이프라인 단계별 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--data-dir', default='bench_data', help='generate_data.py 데이터 폴더')
+    parser.add_argument('--no-memory', action='store_true', help='메모리 측정(tracemalloc) 끄기')
+    parser.add_argument('--baseline', default=None, help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--save-baseline', default=None, help='이번 결과를 기준 결과로 저장할 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='느려짐 허용 비율 (기본 20%%)')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='이보다 작은 차이는 무시')
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.rows:
+        data_dir = generate_data.dataset_dir(args.data_dir, rows)
+        if not os.path.exists(os.path.join(data_dir, FILENAME_CONFIG['impact'])):
+            print(f"{rows}행 데이터 생성 중...")
+            generate_data.generate(rows, data_dir)
+        results[str(rows)] = run_pipeline(data_dir, measure_memory=not args.no_memory)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'memory': not args.no_memory, 'results': results}, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        for rows, stage, before, after in regressions:
+            print(f"느려짐: {rows}행 {stage} {before:.3f}초 -> {after:.3f}초")
+        if regressions:
+            return 1
+        print("기준 결과 대비 느려진 단계가 없습니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+[신규] 엑셀 쓰기 벤치마크: 기존 구현(write_data_to_excel_reference)과
+컬럼별 공용 스타일을 쓰는 구현(write_data_to_excel)의 쓰기/저장 시간을 비교합니다.
+
+실행 예:
+    python benchmarks/bench_write_excel.py --rows 1000 5000 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from generate_data import make_template  # noqa: E402
+from data_processing import (  # noqa: E402
+    TEMPLATE_ORDERED_COLS,
+    write_data_to_excel, write_data_to_excel_reference,
+)
+
+
+def make_ordered_frame(rows, seed=0):
+    """TEMPLATE_ORDERED_COLS 순서의 임의 결과 DataFrame (기본 정보는 문자열, 나머지는 숫자, 약 5%는 빈 값)"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col_num, col in enumerate(TEMPLATE_ORDERED_COLS):
+        if col_num < 9:
+            data[col] = [f'{col}-{i % 500}' for i in range(rows)]
+        else:
+            values = rng.random(rows).round(4) * 100
+            values[rng.random(rows) < 0.05] = np.nan
+            data[col] = values
+    return pd.DataFrame(data)
+
+
+def run(rows, template_path, writer):
+    """양식을 불러와 writer로 쓰고 저장하는 데 걸린 시간(초)을 반환"""
+    final_df_ordered = make_ordered_frame(rows)
+    wb = openpyxl.load_workbook(template_path)
+    started = time.perf_counter()
+    writer(wb, final_df_ordered)
+    write_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    wb.save(os.path.join(os.path.dirname(template_path), 'output.xlsx'))
+    save_seconds = time.perf_counter() - started
+    return write_seconds, save_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엑셀 쓰기 벤치마크 (기존 구현 vs 공용 스타일 구현)')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--reference-max-rows', type=int, default=5000,
+                        help='이 행 수를 넘으면 기존 구현은 건너뜀 (너무 오래 걸림)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template_path = os.path.join(tmp, 'template.xlsx')
+        make_template(template_path)
+
+        print(f"{'rows':>8} | {'writer':<10} | {'write(s)':>9} | {'save(s)':>8}")
+        for rows in args.rows:
+            writers = [('fast', write_data_to_excel)]
+            if rows <= args.reference_max_rows:
+                writers.insert(0, ('reference', write_data_to_excel_reference))
+            results = {}
+            for name, writer in writers:
+                results[name] = run(rows, template_path, writer)
+                write_seconds, save_seconds = results[name]
+                print(f"{rows:>8} | {name:<10} | {write_seconds:>9.2f} | {save_seconds:>8.2f}")
+            if 'reference' in results:
+                speedup = results['reference'][0] / max(results['fast'][0], 1e-9)
+                print(f"{'':>8} | 쓰기 속도 {speedup:.1f}배")
+
+
+if __name__ == '__main__':
+    main()
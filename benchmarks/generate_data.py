@@ -0,0 +1,185 @@
+"""
+[신규] 벤치마크용 가상 시험 결과 파일 생성기
+
+성분/인장 시험 결과(1줄 헤더), 충격 시험 결과(2줄 헤더, 병합 셀)와
+TEMPLATE_ORDERED_COLS에 맞춘 서식 있는 양식 파일을 행 수별 폴더에 만듭니다.
+파일 이름은 FILENAME_CONFIG와 같으므로 각 폴더에서 data_processing.main()을 바로 실행할 수 있습니다.
+
+- 시편배치는 '8자리 키 + 시편 번호' 형태이며, 키 하나당 평균 3회 시험
+- 실제 내보내기 파일처럼 처리에 사용하지 않는 컬럼과 빈 값이 섞여 있음
+
+실행 예:
+    python benchmarks/generate_data.py --rows 1000 10000 --out-dir bench_data
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from data_processing import (  # noqa: E402
+    COMPONENT_ELEMENT_COLS, FILENAME_CONFIG, IMPACT_LOCATIONS, TEMPLATE_HEADER_ROW,
+    TEMPLATE_ORDERED_COLS, TENSILE_DIRECTIONS, TENSILE_RESULT_COLS,
+)
+
+DEFAULT_ROWS = [1000, 10000, 100000, 1000000]
+# 처리에 사용하지 않는 컬럼 수 (실제 내보내기 파일의 나머지 컬럼)
+EXTRA_COLS = 20
+
+
+def make_keys(rows, rng):
+    """행별 복합 키 값(시편배치, 외경, 두께, Heat No.)을 만드는 함수"""
+    key_count = max(rows // 3, 1)
+    key_id = rng.integers(0, key_count, rows)
+    specimen = np.char.add(
+        (10000000 + key_id).astype(str),
+        np.char.add('A', np.char.zfill(rng.integers(0, 3, rows).astype(str), 2)),
+    )
+    outer_diameter = np.array([219.1, 323.9, 406.4, 508.0])[key_id % 4]
+    thickness = np.array([6.4, 7.9, 9.5, 12.7])[key_id % 4]
+    heat_no = np.char.add('H', np.char.zfill((key_id % 997).astype(str), 5))
+    return {'시편배치': specimen, '외경': outer_diameter, '두께': thickness, 'Heat No.': heat_no}
+
+
+def make_component_frame(rows, seed=0):
+    """성분 시험 결과 DataFrame (약 2%는 C 값이 비어 있음)"""
+    rng = np.random.default_rng(seed)
+    keys = make_keys(rows, rng)
+    data = {
+        '시편배치': keys['시편배치'],
+        '생산오더': np.char.add('PO', rng.integers(0, 5000, rows).astype(str)),
+        '제품배치': np.char.add('PB', np.arange(rows).astype(str)),
+        '제품기호': 'API-X56L2-D',
+        '외경': keys['외경'], '두께': keys['두께'], 'Heat No.': keys['Heat No.'],
+        '원재료기호': 'HR-COIL', '원재료업체': 'POSCO',
+    }
+    for col in COMPONENT_ELEMENT_COLS:
+        data[col] = rng.random(rows).round(4)
+    df = pd.DataFrame(data)
+    df.loc[rng.random(rows) < 0.02, 'C'] = np.nan
+    return df
+
+
+def make_tensile_frame(rows, seed=1):
+    """인장 시험 결과 DataFrame (처리 대상이 아닌 방향 값도 포함)"""
+    rng = np.random.default_rng(seed)
+    data = make_keys(rows, rng)
+    directions = np.array(TENSILE_DIRECTIONS + ['Pipe 모재'])
+    data['시편 위치/방향'] = directions[rng.integers(0, len(directions), rows)]
+    for col in TENSILE_RESULT_COLS:
+        data[col] = (rng.random(rows) * 600).round(1)
+    return pd.DataFrame(data)
+
+
+def make_impact_frame(rows, seed=2):
+    """충격 시험 결과 DataFrame (한 줄 컬럼명, 온도 약 10%와 에너지 약 3%는 빈 값)"""
+    rng = np.random.default_rng(seed)
+    data = make_keys(rows, rng)
+    locations = np.array(IMPACT_LOCATIONS + ['Pipe Body'])
+    data['Notch 위치'] = locations[rng.integers(0, len(locations), rows)]
+    for i in range(1, 7):
+        data[f'온도(˚C)_{i}'] = rng.choice([-20.0, -10.0, 0.0, np.nan], rows, p=[0.4, 0.3, 0.2, 0.1])
+    for i in range(1, 4):
+        data[f'에너지(J) SIZE 10보정_{i}'] = (rng.random(rows) * 300).round(1)
+    df = pd.DataFrame(data)
+    df.loc[rng.random(rows) < 0.03, '에너지(J) SIZE 10보정_2'] = np.nan
+    return df
+
+
+def iter_sheet_rows(df, extra_values):
+    """DataFrame 행을 엑셀 행 값 목록으로 돌려주는 함수 (빈 값은 None, 뒤에 사용하지 않는 컬럼 값 추가)"""
+    columns = [df[col].to_numpy(dtype=object) for col in df.columns]
+    for row in zip(*columns):
+        yield [None if value != value else value for value in row] + extra_values
+
+
+def write_flat_workbook(df, path):
+    """1줄 헤더 시험 결과 파일(성분, 인장)을 쓰는 함수"""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append(list(df.columns) + [f'기타{i}' for i in range(1, EXTRA_COLS + 1)])
+    for values in iter_sheet_rows(df, ['-'] * EXTRA_COLS):
+        ws.append(values)
+    wb.save(path)
+
+
+def write_impact_workbook(df, path):
+    """2줄 헤더(온도 6개, 에너지 3개는 병합된 상위 헤더 아래 번호) 충격 시험 결과 파일을 쓰는 함수"""
+    key_cols = ['시편배치', '외경', '두께', 'Heat No.', 'Notch 위치']
+    extra = [f'기타{i}' for i in range(1, EXTRA_COLS + 1)]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    temp_start = len(key_cols) + 1
+    energy_start = temp_start + 6
+    ws.merged_cells.add(f'{get_column_letter(temp_start)}1:{get_column_letter(temp_start + 5)}1')
+    ws.merged_cells.add(f'{get_column_letter(energy_start)}1:{get_column_letter(energy_start + 2)}1')
+    ws.append(key_cols + ['온도(˚C)'] + [None] * 5 + ['에너지(J) SIZE 10보정', None, None] + extra)
+    ws.append([None] * len(key_cols) + [str(i) for i in range(1, 7)] + ['1', '2', '3'] + [None] * EXTRA_COLS)
+    ordered = df[key_cols + [f'온도(˚C)_{i}' for i in range(1, 7)] + [f'에너지(J) SIZE 10보정_{i}' for i in range(1, 4)]]
+    for values in iter_sheet_rows(ordered, ['-'] * EXTRA_COLS):
+        ws.append(values)
+    wb.save(path)
+
+
+def make_template(path):
+    """제목(병합 셀), 헤더 행과 서식이 있는 스타일 행 1개를 가진 양식 파일을 만드는 함수"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws['A1'] = '시험결과 통합'
+    ws['A1'].font = Font(bold=True, size=14)
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=9)
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for col_num, name in enumerate(TEMPLATE_ORDERED_COLS, 1):
+        cell = ws.cell(row=TEMPLATE_HEADER_ROW, column=col_num, value=name)
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill('solid', fgColor='DDEBF7')
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center', wrap_text=True)
+        ws.column_dimensions[cell.column_letter].width = 12
+        # 스타일 행 (write_data_to_excel이 서식을 복사하는 행)
+        cell = ws.cell(row=TEMPLATE_HEADER_ROW + 1, column=col_num, value=None if col_num > 9 else '샘플')
+        cell.font = Font(name='맑은 고딕', size=10)
+        cell.border = border
+        cell.number_format = '0.000' if col_num > 9 else 'General'
+    ws.freeze_panes = ws.cell(row=TEMPLATE_HEADER_ROW + 1, column=2)
+    wb.save(path)
+
+
+def generate(rows, out_dir, seed=0):
+    """rows 행짜리 시험 결과 파일 3개와 양식 파일을 out_dir에 만들고 폴더 경로를 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    make_template(os.path.join(out_dir, FILENAME_CONFIG['template']))
+    write_flat_workbook(make_component_frame(rows, seed), os.path.join(out_dir, FILENAME_CONFIG['component']))
+    write_flat_workbook(make_tensile_frame(rows, seed + 1), os.path.join(out_dir, FILENAME_CONFIG['tensile']))
+    write_impact_workbook(make_impact_frame(rows, seed + 2), os.path.join(out_dir, FILENAME_CONFIG['impact']))
+    return out_dir
+
+
+def dataset_dir(base_dir, rows):
+    """행 수별 데이터 폴더 경로"""
+    return os.path.join(base_dir, f'rows_{rows}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 가상 시험 결과 파일 생성')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--out-dir', default='bench_data')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        started = time.perf_counter()
+        out_dir = generate(rows, dataset_dir(args.out_dir, rows), args.seed)
+        print(f"{rows:>8}행: '{out_dir}' ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+[신규] 변환된 시험 결과 파일을 저장하는 열 기반(Arrow/Feather) 중간 저장소
+
+엑셀(.xlsx) 파일은 매번 압축을 풀고 XML을 읽어야 하므로 느립니다.
+처음 읽을 때 읽기 결과(충격 시험은 정리된 한 줄 컬럼명 포함)를 타입이 있는
+Feather 파일로 한 번 저장해 두고, 이후에는 메모리 맵으로 바로 불러옵니다.
+
+- 파일 위치: {store_dir}/{시험 종류}/{파일 내용 해시}.arrow
+- 압축하지 않은 Feather(Arrow IPC) 형식이므로 메모리 맵으로 복사 없이 읽을 수 있고,
+  pandas(pd.read_feather)나 pyarrow로 여러 달치 데이터를 바로 조회할 수 있습니다.
+- pyarrow가 없거나, 저장할 수 없는 값(문자열과 숫자가 섞인 컬럼 등)이 있으면
+  저장하지 않고 엑셀을 그대로 읽습니다.
+- [수정] 저장소는 임시 폴더가 아닌 설정한 폴더에 계속 남고, 저장할 때마다 prune()으로
+  max_age_days보다 오래 사용하지 않은 파일과 max_bytes를 넘는 오래된 파일을 삭제합니다.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+# pyarrow가 설치되어 있지 않으면 중간 저장소를 사용하지 않음
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# --- 설정 부분 ---
+COLUMNAR_CONFIG = {
+    "enabled": True,
+    # [수정] 변환된 파일을 저장할 폴더 (서버를 재시작해도 남도록 사용자 데이터 폴더에 저장)
+    "store_dir": os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share'),
+                              "seah_test_data", "columnar"),
+    # [신규] 저장소 최대 크기 (바이트, 넘으면 오래 사용하지 않은 파일부터 삭제, None이면 제한 없음)
+    "max_bytes": 5 * 1024 * 1024 * 1024,
+    # [신규] 이 기간(일) 동안 읽거나 쓰지 않은 파일은 삭제 (None이면 기간 제한 없음)
+    "max_age_days": 180,
+}
+
+
+def is_available():
+    """중간 저장소를 사용할 수 있는지 확인하는 함수"""
+    return COLUMNAR_CONFIG['enabled'] and feather is not None
+
+
+def source_digest(source):
+    """
+    원본 파일(경로, 파일 객체 또는 bytes)의 내용 해시를 반환하는 함수
+    파일 객체는 읽은 뒤 처음 위치로 되돌림
+    """
+    if isinstance(source, bytes):
+        data = source
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            data = f.read()
+    else:
+        position = source.tell()
+        data = source.read()
+        source.seek(position)
+    return hashlib.sha256(data).hexdigest()
+
+
+def store_path(kind, digest, version=''):
+    """시험 종류와 내용 해시(+ 읽기 형식 버전)로 저장 파일 경로를 만드는 함수"""
+    name = f"{digest}-{version}.arrow" if version else f"{digest}.arrow"
+    return os.path.join(COLUMNAR_CONFIG['store_dir'], kind, name)
+
+
+def split_store_name(name):
+    """
+    [신규] 저장 파일 이름을 (내용 해시, 읽기 형식 버전, 시트 구분)으로 나누는 함수
+    이름 형식: {해시}.arrow, {해시}-{형식 버전}.arrow, {해시}-{형식 버전}-s{시트}.arrow
+    """
+    digest, _, rest = name.removesuffix('.arrow').partition('-')
+    format_version, _, sheet = rest.partition('-')
+    return digest, format_version, sheet
+
+
+def load(kind, digest, version='', columns=None):
+    """저장된 변환 파일을 메모리 맵으로 읽어 DataFrame으로 반환하는 함수 (없으면 None)"""
+    if not is_available():
+        return None
+    path = store_path(kind, digest, version)
+    try:
+        table = feather.read_table(path, columns=columns, memory_map=True)
+    except FileNotFoundError:
+        return None
+    except (OSError, pa.ArrowException):
+        # 손상된 파일은 삭제하고 엑셀을 다시 읽음
+        _remove(path)
+        return None
+    # 최근 사용 시각 갱신 (prune의 삭제 기준)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return table.to_pandas()
+
+
+def save(kind, digest, df, version=''):
+    """
+    읽기 결과 DataFrame을 변환 파일로 저장하는 함수 (성공하면 True)
+    다시 읽었을 때 원본과 같은 DataFrame이 되는 경우에만 저장
+    """
+    if not is_available():
+        return False
+    path = store_path(kind, digest, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=None)
+        if not table.to_pandas().equals(df):
+            return False
+    except (pa.ArrowException, TypeError, ValueError):
+        return False
+
+    # 다른 프로세스가 동시에 읽어도 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException):
+        _remove(tmp_path)
+        return False
+    _remove_other_versions(os.path.dirname(path), os.path.basename(path))
+    prune()
+    return True
+
+
+def _remove_other_versions(directory, saved_name):
+    """[신규] 같은 원본 파일(시트)을 이전 읽기 형식 버전으로 저장한 파일을 삭제 (load_all 중복 방지)"""
+    digest, format_version, sheet = split_store_name(saved_name)
+    for name in os.listdir(directory):
+        if not name.endswith('.arrow') or name == saved_name:
+            continue
+        other_digest, other_version, other_sheet = split_store_name(name)
+        if other_digest == digest and other_sheet == sheet and other_version != format_version:
+            _remove(os.path.join(directory, name))
+
+
+def prune(now=None):
+    """
+    [신규] 저장소 크기/기간 제한(max_bytes, max_age_days)에 맞게 오래 사용하지 않은 파일을 삭제하는 함수
+    반환: 삭제한 파일 수
+    """
+    store_dir = COLUMNAR_CONFIG['store_dir']
+    if not os.path.isdir(store_dir):
+        return 0
+    entries = []
+    for kind in os.listdir(store_dir):
+        directory = os.path.join(store_dir, kind)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            if not name.endswith('.arrow'):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    now = time.time() if now is None else now
+    max_age_days = COLUMNAR_CONFIG['max_age_days']
+    max_bytes = COLUMNAR_CONFIG['max_bytes']
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in sorted(entries):
+        expired = max_age_days is not None and now - mtime > max_age_days * 24 * 60 * 60
+        if not expired and (max_bytes is None or total <= max_bytes):
+            break
+        _remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def load_all(kind, columns=None):
+    """
+    저장소에 있는 한 시험 종류의 모든 변환 파일을 하나의 DataFrame으로 합치는 함수 (조회용)
+    '원본_해시' 컬럼에 원본 파일의 내용 해시를 넣음
+    [수정] 같은 원본 파일(시트)이 여러 읽기 형식 버전으로 저장되어 있으면 가장 최근에 저장한 파일만 사용
+    """
+    if not is_available():
+        return pd.DataFrame()
+    directory = os.path.join(COLUMNAR_CONFIG['store_dir'], kind)
+    if not os.path.isdir(directory):
+        return pd.DataFrame()
+    latest = {}
+    for name in os.listdir(directory):
+        if not name.endswith('.arrow'):
+            continue
+        digest, _, sheet = split_store_name(name)
+        try:
+            mtime = os.stat(os.path.join(directory, name)).st_mtime
+        except FileNotFoundError:
+            continue
+        if (digest, sheet) not in latest or mtime > latest[(digest, sheet)][0]:
+            latest[(digest, sheet)] = (mtime, name)
+    frames = []
+    for (digest, _), (_, name) in sorted(latest.items()):
+        table = feather.read_table(os.path.join(directory, name), memory_map=True)
+        if columns is not None:
+            table = table.select([col for col in columns if col in table.column_names])
+        df = table.to_pandas()
+        df['원본_해시'] = digest
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,340 @@
+"""
+[신규] 업로드 파일 내용(SHA-256) 기준 캐시
+
+같은 파일을 다시 올리거나 양식만 바꿔서 다시 실행할 때, 읽기/처리 결과를 재사용합니다.
+- 1단계: 메모리 LRU (같은 서버 프로세스의 모든 세션이 공유)
+- 2단계: 로컬 디스크 LRU (서버를 재시작하거나 여러 프로세스가 실행 중이어도 공유)
+캐시 키에는 data_processing.py의 내용 해시(코드/설정 버전)가 포함되므로,
+처리 규칙이나 설정을 바꾸면 이전 결과는 자동으로 사용되지 않습니다.
+"""
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import columnar_store
+import data_processing
+
+# --- 설정 부분 ---
+CACHE_CONFIG = {
+    # 메모리 캐시 최대 크기 (바이트)
+    "memory_max_bytes": 512 * 1024 * 1024,
+    # 디스크 캐시 폴더와 최대 크기 (바이트)
+    # [수정] 캐시 파일은 pickle로 읽으므로 공용 임시 폴더가 아닌 사용자별 폴더를 사용
+    # (이 사용자만 접근할 수 있는 0700 폴더로 만들고, 다른 사용자 소유이면 디스크 캐시를 끔)
+    "disk_dir": os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                             "seah_test_data", "cache"),
+    "disk_max_bytes": 2 * 1024 * 1024 * 1024,
+}
+
+
+def file_digest(data):
+    """
+    파일 내용(bytes)의 SHA-256 해시 문자열을 반환하는 함수
+    [신규] 여러 파일(bytes 목록)이면 파일별 해시를 순서대로 이은 값의 해시
+    """
+    if isinstance(data, (list, tuple)):
+        return file_digest(":".join(file_digest(part) for part in data).encode('utf-8'))
+    return hashlib.sha256(data).hexdigest()
+
+
+def _code_version():
+    """data_processing.py 내용의 해시 (처리 코드/설정이 바뀌면 캐시 키도 바뀜)"""
+    with open(data_processing.__file__, 'rb') as f:
+        return file_digest(f.read())[:16]
+
+
+CODE_VERSION = _code_version()
+
+
+def make_key(*parts):
+    """캐시 키를 만드는 함수 (코드 버전 포함)"""
+    return file_digest(":".join([CODE_VERSION, *map(str, parts)]).encode('utf-8'))
+
+
+def ensure_private_dir(path):
+    """
+    [신규] 이 프로세스의 사용자만 접근할 수 있는 폴더(0700)를 만들고 확인하는 함수
+    이미 있는 폴더가 심볼릭 링크이거나 다른 사용자 소유이면 False
+    (다른 사용자가 넣은 pickle 파일을 읽지 않도록 디스크 캐시를 쓰기 전에 확인)
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode):
+            return False
+        # Windows에는 POSIX 소유자/권한이 없으므로 사용자 프로필 폴더의 접근 권한을 따름
+        if hasattr(os, 'getuid'):
+            if info.st_uid != os.getuid():
+                return False
+            if info.st_mode & 0o077:
+                os.chmod(path, 0o700)
+    except OSError:
+        return False
+    return True
+
+
+class ContentCache:
+    """메모리 + 로컬 디스크 2단계 LRU 캐시 (값은 pickle 가능한 객체)"""
+
+    def __init__(self, memory_max_bytes, disk_dir, disk_max_bytes):
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()  # key -> (value, size)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir and not ensure_private_dir(disk_dir):
+            print(f"캐시 폴더 '{disk_dir}'를 이 사용자만 쓸 수 있게 만들 수 없어 디스크 캐시를 사용하지 않습니다.")
+            self.disk_dir = None
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """캐시에서 값을 찾아 반환 (없으면 None). 디스크에서 찾은 값은 메모리로 올림"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return _shallow_copy(self._memory[key][0])
+
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            # 최근 사용 시각 갱신 (디스크 LRU 기준)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        try:
+            value = pickle.loads(payload)
+        except Exception:
+            # 손상된 캐시 파일은 삭제
+            self._remove_disk(path)
+            return None
+        self._put_memory(key, value, memory_size(value))
+        return _shallow_copy(value)
+
+    def put(self, key, value, disk=True):
+        """
+        메모리와 디스크에 값을 저장하고, 최대 크기를 넘으면 오래 사용하지 않은 항목부터 삭제
+        disk=False이면 메모리에만 저장
+        """
+        self._put_memory(key, value, memory_size(value))
+        # [수정] pickle은 디스크에 쓸 때만 만듦 (메모리에만 저장하는 큰 원본 DataFrame의 불필요한 직렬화/복사 방지)
+        if self.disk_dir and disk:
+            self._put_disk(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _put_memory(self, key, value, size):
+        if size > self.memory_max_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            self._memory[key] = (value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes:
+                _, (_, old_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= old_size
+
+    def _put_disk(self, key, payload):
+        if len(payload) > self.disk_max_bytes:
+            return
+        # 다른 프로세스가 동시에 읽어도 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            self._remove_disk(tmp_path)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            self._remove_disk(path)
+            total -= size
+
+    @staticmethod
+    def _remove_disk(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """메모리와 디스크 캐시를 모두 비우는 함수"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    self._remove_disk(os.path.join(self.disk_dir, name))
+
+
+def memory_size(value):
+    """
+    [신규] 메모리 캐시 크기 계산용 값의 크기(바이트)
+    DataFrame은 memory_usage(deep=True), bytes는 길이, 그 밖의 값은 pickle 크기
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _shallow_copy(value):
+    """캐시된 DataFrame에 컬럼을 추가해도 캐시 원본이 바뀌지 않도록 얕은 복사본을 반환"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    return value
+
+
+# 서버 프로세스 전체에서 공유하는 캐시
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """공유 캐시 객체를 반환하는 함수 (처음 호출할 때 CACHE_CONFIG로 생성)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ContentCache(**CACHE_CONFIG)
+        return _cache
+
+
+def read_and_process_all_cached(file_bytes, digests=None, max_workers=None, use_processes=None, profile=None,
+                                all_sheets=False):
+    """
+    [신규] 여러 시험 결과 파일을 읽고 처리한 DataFrame을 {종류: DataFrame}으로 반환하는 함수
+
+    - file_bytes: {'component': bytes, 'tensile': bytes, 'impact': bytes}
+      [신규] 종류마다 여러 파일이면 bytes 목록 (data_processing.read_test_sources로 합침)
+    - all_sheets=True이면 각 파일의 모든 시트를 읽음 (캐시 키에도 포함)
+    - 캐시에 처리 결과가 없는 파일만 data_processing.run_in_parallel로 동시에 읽고 처리
+    - 읽기에 실패한 파일은 빈 DataFrame
+    - profile: data_processing.PipelineProfile을 넘기면 종류별 읽기/처리 단계 기록을 추가
+    """
+    cache = get_cache()
+    digests = digests or {kind: file_digest(data) for kind, data in file_bytes.items()}
+
+    skipped_record = data_processing.PipelineProfile.skipped_record
+    results = {}
+    records = {kind: [] for kind in file_bytes}
+    pending = []
+    for kind, data in file_bytes.items():
+        processed_df = cache.get(make_key('processed', kind, digests[kind], all_sheets))
+        if processed_df is not None:
+            results[kind] = processed_df
+            records[kind].append(skipped_record(f'process_{kind}', '캐시', len(processed_df)))
+            continue
+        raw_df = cache.get(make_key('parsed', kind, digests[kind], all_sheets))
+        if raw_df is not None:
+            records[kind].append(skipped_record(f'read_{kind}', '캐시', len(raw_df)))
+        # 원본이 캐시에 있으면 파일 내용 대신 원본을 넘겨 읽기 단계를 건너뜀
+        pending.append((kind, None if raw_df is not None else data, raw_df, raw_df is None, True, all_sheets))
+
+    # [수정] 캐시로 끝난 종류의 기록은 바로 추가하고, 실행할 종류는 시작을 먼저 알림
+    # (진행률이 읽기/처리 동안에도 올라가고, 시작 알림에서 작업 취소를 확인)
+    if profile is not None:
+        for kind in file_bytes:
+            if kind in results:
+                profile.extend(records[kind])
+        if pending:
+            profile.start(pending_stage(pending[0]))
+
+    def on_result(i, output):
+        kind, _, _, read_here, *_ = pending[i]
+        raw_df, processed_df, messages, stage_records = output
+        # 작업 중 모아 둔 오류 메시지를 파일 순서대로 출력
+        for message in messages:
+            data_processing.report_error(message)
+        if raw_df is None:
+            results[kind] = pd.DataFrame()
+        else:
+            if read_here:
+                # 읽기 결과는 열 기반 중간 저장소에도 저장되므로 디스크 캐시에는 중복 저장하지 않음
+                cache.put(make_key('parsed', kind, digests[kind], all_sheets), raw_df,
+                          disk=not columnar_store.is_available())
+            if not processed_df.empty:
+                cache.put(make_key('processed', kind, digests[kind], all_sheets), processed_df)
+            results[kind] = processed_df
+        if profile is not None:
+            profile.extend(records[kind] + stage_records)
+            # 다음 종류를 기다리기 전에 시작을 알림 (취소 요청이 있으면 여기서 중단)
+            if i + 1 < len(pending):
+                profile.start(pending_stage(pending[i + 1]))
+
+    data_processing.run_in_parallel(
+        data_processing.read_and_process, pending,
+        max_workers=max_workers, use_processes=use_processes, on_result=on_result,
+    )
+    return {kind: results[kind] for kind in file_bytes}
+
+
+def pending_stage(args):
+    """실행할 작업(read_and_process 인자)의 첫 단계 이름 (원본이 캐시에 있으면 처리 단계)"""
+    kind, _, _, read_here, *_ = args
+    return f'read_{kind}' if read_here else f'process_{kind}'
+
+
+def read_all_cached(file_bytes, digests=None, max_workers=None, use_processes=None, all_sheets=False):
+    """
+    [신규] 여러 시험 결과 파일을 읽기만 한 원본 DataFrame을 {종류: DataFrame}으로 반환하는 함수
+    (증분 추가 모드에서 사용, 읽기에 실패한 파일은 None)
+    file_bytes와 all_sheets는 read_and_process_all_cached와 같음
+    """
+    cache = get_cache()
+    digests = digests or {kind: file_digest(data) for kind, data in file_bytes.items()}
+
+    results = {}
+    pending = []
+    for kind, data in file_bytes.items():
+        raw_df = cache.get(make_key('parsed', kind, digests[kind], all_sheets))
+        if raw_df is not None:
+            results[kind] = raw_df
+        else:
+            pending.append((kind, data, None, True, False, all_sheets))
+
+    outputs = data_processing.run_in_parallel(
+        data_processing.read_and_process, pending,
+        max_workers=max_workers, use_processes=use_processes,
+    )
+    for (kind, *_), (raw_df, _, messages, _) in zip(pending, outputs):
+        for message in messages:
+            data_processing.report_error(message)
+        if raw_df is not None:
+            # 읽기 결과는 열 기반 중간 저장소에도 저장되므로 디스크 캐시에는 중복 저장하지 않음
+            cache.put(make_key('parsed', kind, digests[kind], all_sheets), raw_df, disk=not columnar_store.is_available())
+        results[kind] = raw_df
+
+    return {kind: results[kind] for kind in file_bytes}
+
+
+def output_key(template_digest, component_digest, tensile_digest, impact_digest, all_sheets=False):
+    """4개 파일 해시(+ 모든 시트 읽기 여부)로 최종 결과 파일 캐시 키를 만드는 함수"""
+    return make_key('output', template_digest, component_digest, tensile_digest, impact_digest, all_sheets)
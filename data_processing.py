@@ -0,0 +1,2377 @@
+import pandas as pd
+import numpy as np
+import openpyxl
+from openpyxl.styles import Font, Alignment, PatternFill, Border
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.worksheet.dimensions import ColumnDimension
+from pandas.io.parsers import TextParser
+from copy import copy, deepcopy
+from collections import OrderedDict, namedtuple
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# [신규] 프로세스 최대 메모리 확인용 (Windows에는 없는 모듈)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# [신규] 변환된 시험 결과 파일을 저장하는 열 기반(Arrow/Feather) 중간 저장소
+import columnar_store
+
+# [신규] 더 빠른 엑셀 읽기 엔진 (python-calamine이 설치되어 있으면 사용, 없으면 openpyxl 스트리밍 읽기)
+try:
+    import python_calamine  # noqa: F401
+    FAST_EXCEL_ENGINE = 'calamine'
+except ImportError:
+    FAST_EXCEL_ENGINE = None
+
+# --- 설정 부분 ---
+# 사용자는 이 부분에서 파일 이름만 실제 파일에 맞게 수정하면 됩니다.
+FILENAME_CONFIG = {
+    "template": "시험결과 통합 양식.xlsx",
+    "component": "API-X56L2-D 성분시험결과.xlsx",
+    "tensile": "API-X56L2-D 인장시험결과.xlsx",
+    "impact": "API-X56L2-D 충격시험결과.xlsx",
+    "output": "통합_시험_결과_완성본.xlsx"
+}
+# [신규] 성분/인장/충격은 파일 이름 목록도 가능 (예: 월별 내보내기 파일, 목록 순서 = 시험 순서)
+# 여러 파일에 같은 행이 있으면(겹치는 기간) 처음 나온 행만 사용합니다.
+READ_CONFIG = {
+    # True이면 각 파일의 모든 시트를 차례로 읽음 (False이면 첫 번째 시트만)
+    "all_sheets": False,
+}
+
+# [수정] 템플릿의 헤더가 시작되는 행 번호
+TEMPLATE_HEADER_ROW = 3
+
+# [신규] 증분 추가 모드: 양식(누적 결과 파일)에 이미 있는 키는 건너뛰고,
+# 새로 생긴 키는 아래에 추가, 입력 데이터가 바뀐 키는 해당 행을 덮어씀
+INCREMENTAL_CONFIG = {
+    "enabled": False,
+    # [수정] 키별 입력 데이터/결과 행의 지문을 저장하는 숨김 시트 (누적 결과 파일마다 따로 저장됨)
+    "index_sheet": "_키목록",
+    # 이전 버전의 로컬 키 목록 파일 (결과 파일에 키 목록 시트가 없을 때 한 번만 읽음)
+    "legacy_index_path": "통합_시험_결과_키목록.json",
+}
+
+# [신규] True이면 결과를 스트리밍(write-only) 방식으로 저장 (결과 행이 매우 많을 때 메모리 절약)
+STREAMING_OUTPUT = False
+# [신규] 스트리밍 저장 시 한 번에 변환하는 DataFrame 행 수
+STREAMING_CHUNK_ROWS = 10000
+
+# [신규] 대용량(메모리 초과) 분할 처리 모드 설정 (consolidate_out_of_core 참고)
+# 원본 행을 복합 키 해시로 나눠 임시 파일에 옮긴 뒤, 분할별로 처리하여 결과 파일에 바로 기록
+OUT_OF_CORE_CONFIG = {
+    "enabled": False,
+    # 복합 키 해시로 나눌 분할 수 (클수록 분할 하나를 처리할 때의 메모리 사용량이 작아짐)
+    "partitions": 16,
+    # 엑셀에서 한 번에 읽어 분할 파일로 보내는 행 수
+    "chunk_rows": 20000,
+    # 분할 임시 파일을 만들 폴더 (None이면 시스템 임시 폴더, 작업이 끝나면 삭제)
+    "spill_dir": None,
+}
+
+# [신규] 읽어 둔 양식 파일 캐시 설정 (get_template 참고)
+TEMPLATE_CACHE_CONFIG = {
+    # 내용 해시 기준으로 메모리에 보관할 양식 수 (가장 오래 사용하지 않은 양식부터 삭제)
+    "max_entries": 8,
+}
+
+# [신규] 성분/인장/충격 파일 읽기+처리 병렬 실행 설정
+PARALLEL_CONFIG = {
+    # 동시에 실행할 작업 수 (1 이하이면 순차 실행, 기본은 CPU 코어 수까지)
+    "max_workers": min(3, os.cpu_count() or 1),
+    # True이면 프로세스 풀(엑셀 파싱은 CPU 작업), 실패하거나 False이면 스레드 풀 사용
+    "use_processes": True,
+    # 프로세스 시작 방식 (Streamlit 서버처럼 스레드가 있는 프로세스에서는 'spawn'이 안전)
+    "start_method": "spawn",
+}
+
+# [신규] 단계별 소요 시간/메모리 계측 설정
+PROFILE_CONFIG = {
+    # True이면 tracemalloc으로 단계별 최대 메모리를 측정 (정확하지만 느려짐)
+    # False이면 단계 동안 현재 메모리(RSS)를 주기적으로 읽어 시작 시점 대비 최대 증가량을 기록
+    "trace_memory": False,
+    # [신규] 현재 메모리(RSS)를 읽는 간격 (초)
+    "sample_seconds": 0.02,
+    # 실행마다 계측 결과를 JSON 한 줄로 추가할 파일 경로 (None이면 저장하지 않음)
+    "json_path": None,
+}
+
+# [신규] 템플릿의 열 순서에 맞춘 최종 DataFrame의 열 목록
+# 이 목록은 템플릿의 헤더 순서와 정확히 일치해야 합니다.
+TEMPLATE_ORDERED_COLS = [
+    '시편배치', '생산오더', '제품배치', '제품기호', '외경', '두께', 'Heat No.', '원재료기호', '원재료업체',
+    # 성분 1 (19개)
+    'C_1', 'Si_1', 'Mn_1', 'P_1', 'S_1', 'Cu_1', 'Ni_1', 'Cr_1', 'Mo_1', 'V_1', 'Nb_1', 'Ti_1', 'Alsol_1', 'Aloxy_1', 'Al_1', 'Ca_1', 'B_1', 'PCM_1', 'CEQ_1',
+    # 성분 2 (19개)
+    'C_2', 'Si_2', 'Mn_2', 'P_2', 'S_2', 'Cu_2', 'Ni_2', 'Cr_2', 'Mo_2', 'V_2', 'Nb_2', 'Ti_2', 'Alsol_2', 'Aloxy_2', 'Al_2', 'Ca_2', 'B_2', 'PCM_2', 'CEQ_2',
+    # 인장 L (4개)
+    'Stripe 모재 L방향_YS2 STRESS', 'Stripe 모재 L방향_TS STRESS', 'Stripe 모재 L방향_연신율 EL(%)', 'Stripe 모재 L방향_YR(%)',
+    # 인장 T (4개)
+    'Stripe 모재 T방향_YS2 STRESS', 'Stripe 모재 T방향_TS STRESS', 'Stripe 모재 T방향_연신율 EL(%)', 'Stripe 모재 T방향_YR(%)',
+    # 인장 용접 (4개)
+    'Stripe 용접_YS2 STRESS', 'Stripe 용접_TS STRESS', 'Stripe 용접_연신율 EL(%)', 'Stripe 용접_YR(%)',
+    # 충격 Base (5개)
+    'Base (Transeverse)_온도', 'Base (Transeverse)_1', 'Base (Transeverse)_2', 'Base (Transeverse)_3', 'Base (Transeverse)_Avg',
+    # 충격 Weld (5개)
+    'Weld Line_온도', 'Weld Line_1', 'Weld Line_2', 'Weld Line_3', 'Weld Line_Avg',
+    # 충격 HAZ (5개)
+    'HAZ_온도', 'HAZ_1', 'HAZ_2', 'HAZ_3', 'HAZ_Avg'
+]
+
+# [신규] 데이터 처리에 사용하는 컬럼 정의
+# 파일을 읽을 때도 이 컬럼들만 읽어 시간과 메모리를 절약합니다.
+BASE_KEY_COLS = ['시편배치', '외경', '두께', 'Heat No.']
+COMPONENT_INFO_COLS = ['생산오더', '제품배치', '제품기호', '원재료기호', '원재료업체', '시편배치']
+COMPONENT_ELEMENT_COLS = ['C', 'Si', 'Mn', 'P', 'S', 'Cu', 'Ni', 'Cr', 'Mo', 'V', 'Nb', 'Ti', 'Alsol', 'Aloxy', 'Al', 'Ca', 'B', 'PCM', 'CEQ']
+TENSILE_DIRECTION_COL = '시편 위치/방향'
+TENSILE_DIRECTIONS = ["Stripe 모재 L방향", "Stripe 모재 T방향", "Stripe 용접"]
+TENSILE_RESULT_COLS = ["YS2 STRESS", "TS STRESS", "연신율 EL(%)", "YR(%)"]
+IMPACT_KEY_KEYWORDS = ['시편배치', '외경', '두께', 'Heat No.', 'Notch 위치']
+IMPACT_LOCATIONS = ["Base (Transeverse)", "Weld Line", "HAZ"]
+IMPACT_TEMP_COLS = [f'온도(˚C)_{i}' for i in range(1, 7)]
+IMPACT_ENERGY_COLS = [f'에너지(J) SIZE 10보정_{i}' for i in range(1, 4)]
+
+COMPONENT_READ_COLS = list(dict.fromkeys(BASE_KEY_COLS + COMPONENT_INFO_COLS + COMPONENT_ELEMENT_COLS))
+TENSILE_READ_COLS = BASE_KEY_COLS + [TENSILE_DIRECTION_COL] + TENSILE_RESULT_COLS
+
+# [신규] 메모리 절약용 컬럼 타입 설정 (compact_dtypes 참고)
+DTYPE_CONFIG = {
+    "enabled": True,
+    # 고유값 수가 행 수의 이 비율 이하인 문자열 컬럼만 category로 변환
+    "category_max_ratio": 0.5,
+}
+# [신규] 원본에서 category로 바꿀 반복 문자열 컬럼 (충격 시험은 정리된 컬럼명에 포함된 키워드)
+# 복합 키 컬럼은 category 대신 factorize_keys로 정수 코드를 만들어 사용
+RAW_CATEGORY_KEYWORDS = {
+    'component': ['생산오더', '제품배치', '제품기호', '원재료기호', '원재료업체'],
+    'tensile': [TENSILE_DIRECTION_COL],
+    'impact': ['Notch 위치'],
+}
+# [신규] 처리 결과를 outer join 할 때 사용하는 정수 키 코드 인덱스 이름
+KEY_CODE_NAME = '_키_코드'
+
+# [신규] 읽기 형식 버전 (읽는 컬럼이 바뀌면 중간 저장소의 이전 변환 파일은 사용하지 않음)
+READ_FORMAT_VERSION = hashlib.sha256(repr((
+    COMPONENT_READ_COLS, TENSILE_READ_COLS, IMPACT_KEY_KEYWORDS, IMPACT_TEMP_COLS, IMPACT_ENERGY_COLS,
+    DTYPE_CONFIG, RAW_CATEGORY_KEYWORDS,
+)).encode('utf-8')).hexdigest()[:8]
+
+
+# --- 오류 메시지 출력 ---
+
+# [신규] 오류 메시지를 출력하는 함수 (기본은 print, Streamlit 앱에서는 st.error로 교체)
+_error_handler = print
+# [신규] 스레드별로 오류 메시지를 모을 때 사용 (collect_errors 참고)
+_thread_local = threading.local()
+
+
+def set_error_handler(handler):
+    """[신규] 오류 메시지를 받을 함수를 지정하는 함수 (예: st.error)"""
+    global _error_handler
+    _error_handler = handler
+
+
+def report_error(message):
+    """[신규] 지정된 방식(print, st.error 등)으로 오류 메시지를 출력하는 함수"""
+    collected = getattr(_thread_local, 'messages', None)
+    if collected is not None:
+        collected.append(message)
+    else:
+        _error_handler(message)
+
+
+@contextmanager
+def collect_errors():
+    """
+    [신규] with 블록 안에서 발생한 오류 메시지를 출력하지 않고 리스트에 모으는 함수
+    (병렬 작업에서는 st.error를 직접 호출할 수 없으므로, 모은 메시지를 호출한 쪽에서 출력)
+    """
+    previous = getattr(_thread_local, 'messages', None)
+    _thread_local.messages = []
+    try:
+        yield _thread_local.messages
+    finally:
+        _thread_local.messages = previous
+
+
+# --- 단계별 계측 ---
+
+def process_peak_memory_mb():
+    """[신규] 현재 프로세스의 최대 메모리 사용량(MB, RSS 기준). 확인할 수 없으면 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / 1024 / (1024 if sys.platform == 'darwin' else 1), 1)
+
+
+# 메모리 페이지 크기 (/proc/self/statm의 값은 페이지 수)
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_memory_mb():
+    """[신규] 현재 프로세스의 메모리 사용량(MB, RSS 기준). /proc/self/statm이 없으면(Linux 외) None"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * _PAGE_SIZE / 1024 / 1024
+
+
+class MemorySampler:
+    """
+    [신규] 단계 동안 작은 스레드로 현재 메모리(RSS)를 주기적으로 읽어 최대값을 기록하는 클래스
+    프로세스 전체의 최대 메모리(ru_maxrss)와 달리 앞 단계에서 많이 썼어도 이 단계의 사용량을 알 수 있음
+    (같은 프로세스에서 동시에 실행 중인 다른 작업의 메모리도 함께 측정됨)
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.base = current_memory_mb()
+        self.peak = self.base
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='memory-sampler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        value = current_memory_mb()
+        if value is not None and value > self.peak:
+            self.peak = value
+
+    def stop(self):
+        """샘플링을 멈추고 시작 시점 대비 최대 증가량(MB)을 반환"""
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return round(self.peak - self.base, 1)
+
+
+class PipelineProfile:
+    """
+    [신규] 파이프라인 단계(읽기, 처리, 병합, 쓰기, 저장)별로
+    소요 시간, 입력/출력 행 수, 최대 메모리를 기록하는 클래스
+
+    [수정] peak_mb는 그 단계에서 늘어난 메모리입니다.
+    - trace_memory이면 단계 시작 대비 tracemalloc 최대값
+    - 아니면 단계 동안 현재 RSS를 주기적으로 읽은 최대값 - 시작 시점 RSS (MemorySampler)
+    - 현재 RSS를 읽을 수 없는 환경(Linux 외)이면 프로세스 최대 RSS가 늘어난 양 (앞 단계보다 적게 쓰면 0)
+    process_peak_mb는 단계가 끝난 시점의 프로세스 전체 최대 RSS(기록한 프로세스 기준)입니다.
+
+    사용 예:
+        with profile.stage('assemble', rows_in=len(df)) as record:
+            ...
+            record['rows_out'] = len(final_df_ordered)
+
+    [신규] listener: 단계가 시작/끝날 때 listener('start' 또는 'end', 기록)를 호출 (진행 상황 표시용)
+    'start'에서 예외를 내면 그 단계는 실행되지 않음 (작업 취소에 사용)
+    """
+    COLUMNS = ['stage', 'seconds', 'rows_in', 'rows_out', 'peak_mb', 'process_peak_mb', 'note']
+
+    def __init__(self, trace_memory=None, listener=None):
+        self.trace_memory = PROFILE_CONFIG['trace_memory'] if trace_memory is None else trace_memory
+        self.listener = listener
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = dict.fromkeys(self.COLUMNS)
+        record.update(stage=name, rows_in=rows_in)
+        if self.listener is not None:
+            self.listener('start', record)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        elif current_memory_mb() is not None:
+            sampler = MemorySampler(PROFILE_CONFIG['sample_seconds'])
+        else:
+            sampler = None
+            base_memory = process_peak_memory_mb()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - started, 4)
+            record['process_peak_mb'] = process_peak_memory_mb()
+            if self.trace_memory:
+                record['peak_mb'] = round((tracemalloc.get_traced_memory()[1] - base_memory) / 1024 / 1024, 1)
+            elif sampler is not None:
+                record['peak_mb'] = sampler.stop()
+            elif base_memory is not None:
+                record['peak_mb'] = round(record['process_peak_mb'] - base_memory, 1)
+            self.records.append(record)
+            if self.listener is not None:
+                self.listener('end', record)
+
+    @classmethod
+    def skipped_record(cls, name, note, rows_out=None):
+        """실제로 실행하지 않은 단계(캐시 사용 등)의 기록 (소요 시간 0)"""
+        record = dict.fromkeys(cls.COLUMNS)
+        record.update(stage=name, seconds=0.0, rows_out=rows_out, note=note)
+        return record
+
+    def start(self, name, rows_in=None):
+        """
+        [신규] 다른 프로세스/스레드에서 실행 중인 단계를 기다리기 시작할 때 listener에 'start'를 알림
+        (기록은 단계가 끝난 뒤 extend로 추가, listener가 예외를 내면 그대로 전달)
+        """
+        if self.listener is not None:
+            record = dict.fromkeys(self.COLUMNS)
+            record.update(stage=name, rows_in=rows_in)
+            self.listener('start', record)
+
+    def extend(self, records):
+        """다른 프로세스/스레드에서 기록한 단계를 추가"""
+        for record in records:
+            self.records.append(record)
+            if self.listener is not None:
+                self.listener('end', record)
+
+    def total_seconds(self):
+        return round(sum(record['seconds'] or 0 for record in self.records), 4)
+
+    def to_frame(self):
+        df = pd.DataFrame(self.records, columns=self.COLUMNS)
+        return df.astype({'rows_in': 'Int64', 'rows_out': 'Int64'})
+
+    def format_table(self):
+        """단계별 기록을 출력용 표 문자열로 만드는 함수"""
+        def text(value):
+            return '-' if value is None else str(value)
+        lines = [f"{'stage':<20} | {'seconds':>8} | {'rows_in':>8} | {'rows_out':>8} | {'peak MB':>8} | {'proc MB':>8}"]
+        for record in self.records:
+            stage = record['stage'] + (f" ({record['note']})" if record['note'] else '')
+            lines.append(f"{stage:<20} | {record['seconds']:>8.3f} | {text(record['rows_in']):>8} | "
+                         f"{text(record['rows_out']):>8} | {text(record['peak_mb']):>8} | "
+                         f"{text(record['process_peak_mb']):>8}")
+        lines.append(f"{'total':<20} | {self.total_seconds():>8.3f} |")
+        return '\n'.join(lines)
+
+    def export_json(self, path=None, **extra):
+        """
+        계측 결과를 JSON 한 줄로 파일에 추가하는 함수 (모니터링 수집용)
+        path가 None이면 PROFILE_CONFIG['json_path']를 사용하며, 둘 다 없으면 저장하지 않음
+        """
+        path = path or PROFILE_CONFIG['json_path']
+        if not path:
+            return
+        entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'total_seconds': self.total_seconds(),
+                 **extra, 'stages': self.records}
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+# --- 데이터 처리 함수들 ---
+
+def convert_excel_cell(cell):
+    """[신규] openpyxl 셀 값을 pandas.read_excel과 같은 규칙으로 변환하는 함수"""
+    if cell.value is None:
+        return ""
+    elif cell.data_type == TYPE_ERROR:
+        return np.nan
+    elif cell.data_type == TYPE_NUMERIC:
+        # 정수로 표현 가능한 숫자는 int로 변환
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+    return cell.value
+
+
+def fill_header_row(row, control_row):
+    """[신규] 다중 헤더에서 병합 셀(빈 칸)을 같은 상위 헤더 안에서만 앞의 값으로 채우는 함수 (pandas와 동일)"""
+    last = row[0]
+    for i in range(1, len(row)):
+        if not control_row[i]:
+            last = row[i]
+        if row[i] == "" or row[i] is None:
+            row[i] = last
+        else:
+            control_row[i] = False
+            last = row[i]
+    return row, control_row
+
+
+def read_header_columns(rows, header_rows=1):
+    """[신규] openpyxl 행 반복자에서 헤더 행을 읽어 컬럼명(Index)을 반환하는 함수 (빈 시트면 None)"""
+    header = 0 if header_rows == 1 else list(range(header_rows))
+    header_data = [[convert_excel_cell(cell) for cell in row] for row in islice(rows, header_rows)]
+    if not any(header_data):
+        return None
+    if header_rows > 1:
+        width = max(len(row) for row in header_data)
+        header_data = [row + [""] * (width - len(row)) for row in header_data]
+        control_row = [True] * width
+        for i in range(header_rows):
+            header_data[i], control_row = fill_header_row(header_data[i], control_row)
+    return TextParser(header_data, header=header).read().columns
+
+
+def read_excel_columns(filename, select_columns, header_rows=1, sheet_name=0):
+    """
+    [신규] 헤더만 먼저 읽어 필요한 컬럼을 고른 뒤, 그 컬럼만 읽어오는 함수
+
+    - select_columns: 헤더 컬럼명 목록을 받아 읽을 컬럼의 위치(0부터) 목록을 반환하는 함수
+      (header_rows가 2 이상이면 컬럼명은 튜플)
+    - python-calamine이 설치되어 있으면 calamine 엔진으로, 없으면 openpyxl read-only 모드로
+      한 줄씩 읽으면서 필요한 컬럼의 값만 보관합니다.
+    """
+    header = 0 if header_rows == 1 else list(range(header_rows))
+
+    if FAST_EXCEL_ENGINE:
+        if hasattr(filename, 'seek'): filename.seek(0)
+        columns = pd.read_excel(filename, sheet_name=sheet_name, header=header, nrows=0, engine=FAST_EXCEL_ENGINE).columns
+        positions = select_columns(list(columns))
+        if hasattr(filename, 'seek'): filename.seek(0)
+        df = pd.read_excel(filename, sheet_name=sheet_name, header=None, skiprows=header_rows,
+                           usecols=positions, engine=FAST_EXCEL_ENGINE)
+        df.columns = columns[positions]
+        return df
+
+    if hasattr(filename, 'seek'): filename.seek(0)
+    wb = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        ws.reset_dimensions()
+        rows = ws.iter_rows()
+
+        # 1. 헤더 행만 먼저 읽어 컬럼명 결정
+        columns = read_header_columns(rows, header_rows)
+        if columns is None:
+            # [신규] 빈 시트는 컬럼이 없는 빈 DataFrame
+            return pd.DataFrame()
+        positions = select_columns(list(columns))
+
+        # 2. 데이터 행은 필요한 컬럼의 값만 보관 (뒤쪽의 빈 행은 제외)
+        data = []
+        last_row_with_data = -1
+        for row in rows:
+            converted_row = [convert_excel_cell(row[i]) if i < len(row) else "" for i in positions]
+            if any(value != "" for value in converted_row):
+                last_row_with_data = len(data)
+            data.append(converted_row)
+        data = data[: last_row_with_data + 1]
+    finally:
+        wb.close()
+
+    df = TextParser(data, header=None, names=list(range(len(positions)))).read()
+    df.columns = columns[positions]
+    return df
+
+
+def iter_excel_column_chunks(filename, select_columns, header_rows=1, sheet_name=0, chunk_rows=STREAMING_CHUNK_ROWS):
+    """
+    [신규] read_excel_columns와 같이 필요한 컬럼만 읽되, chunk_rows 행씩 DataFrame 조각으로 돌려주는 함수
+    (openpyxl read-only 모드로 한 줄씩 읽으므로 파일 크기와 관계없이 메모리 사용량이 일정)
+
+    - 값이 모두 빈 행은 건너뜀
+    - 타입은 조각마다 추론하므로 같은 컬럼도 조각에 따라 정수/실수 등으로 다를 수 있음
+    """
+    if hasattr(filename, 'seek'): filename.seek(0)
+    wb = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        ws.reset_dimensions()
+        rows = ws.iter_rows()
+        columns = read_header_columns(rows, header_rows)
+        if columns is None:
+            return
+        positions = select_columns(list(columns))
+        names = columns[positions]
+
+        data = []
+        for row in rows:
+            converted_row = [convert_excel_cell(row[i]) if i < len(row) else "" for i in positions]
+            if any(value != "" for value in converted_row):
+                data.append(converted_row)
+            if len(data) >= chunk_rows:
+                df = TextParser(data, header=None, names=list(range(len(positions)))).read()
+                df.columns = names
+                yield df
+                data = []
+        if data:
+            df = TextParser(data, header=None, names=list(range(len(positions)))).read()
+            df.columns = names
+            yield df
+    finally:
+        wb.close()
+
+
+def get_data(filename, sheet_name=0, columns=None):
+    """
+    엑셀 파일을 안전하게 읽어오는 함수
+    [신규] columns를 지정하면 해당 컬럼만 읽음 (없는 컬럼은 무시)
+    """
+    try:
+        if columns is None:
+            return pd.read_excel(filename, sheet_name=sheet_name)
+        wanted = set(columns)
+        return read_excel_columns(filename, lambda cols: [i for i, col in enumerate(cols) if col in wanted], sheet_name=sheet_name)
+    except FileNotFoundError:
+        report_error(f"오류: '{filename}' 파일을 찾을 수 없습니다. 스크립트와 같은 폴더에 파일이 있는지 확인하세요.")
+        return None
+    except Exception as e:
+        report_error(f"오류: '{filename}' 파일을 읽는 중 문제가 발생했습니다: {e}")
+        return None
+
+
+def flatten_impact_columns(columns):
+    """[신규] 2줄 헤더(튜플) 컬럼명을 '상위_하위' 형태의 한 줄 컬럼명으로 정리하는 함수"""
+    new_columns = []
+    for col in columns:
+        level1 = str(col[0]) if 'Unnamed:' not in str(col[0]) else ''
+        level2 = str(col[1]) if 'Unnamed:' not in str(col[1]) else ''
+        
+        if level1 and level2:
+            new_columns.append(f"{level1}_{level2}")
+        elif level1:
+            new_columns.append(level1)
+        else:
+            new_columns.append(level2)
+    return new_columns
+
+
+def find_column(columns, keyword):
+    """[신규] 정확히 일치하는 컬럼명을 먼저 찾고, 없으면 키워드를 포함하는 첫 컬럼명을 반환하는 함수"""
+    if keyword in columns:
+        return keyword
+    for col in columns:
+        if keyword in col:
+            return col
+    return None
+
+
+def select_impact_columns(columns):
+    """[신규] 충격 시험 파일에서 처리에 필요한 컬럼(키, Notch 위치, 온도, 에너지)의 위치를 찾는 함수"""
+    flat = flatten_impact_columns(columns)
+    wanted = [find_column(flat, keyword) for keyword in IMPACT_KEY_KEYWORDS] + IMPACT_TEMP_COLS + IMPACT_ENERGY_COLS
+    return sorted({flat.index(col) for col in wanted if col in flat})
+
+
+def get_impact_data_with_multiheader(filename, projected=True, sheet_name=0):
+    """
+    [수정] 2줄 헤더를 가진 충격 시험 엑셀 파일을 읽고 컬럼명을 정리하는 함수
+    [신규] projected=True이면 처리에 필요한 컬럼만 읽음
+    """
+    try:
+        if projected:
+            df = read_excel_columns(filename, select_impact_columns, header_rows=2, sheet_name=sheet_name)
+        else:
+            df = pd.read_excel(filename, sheet_name=sheet_name, header=[0, 1])
+        
+        df.columns = flatten_impact_columns(df.columns)
+        
+        # [수정] 원본 컬럼명(다중 헤더)도 유지하여 키 컬럼 접근에 사용
+        # 예: ('시편배치', '시편배치') -> '시편배치'
+        # df.columns에서 '시편배치', '외경', '두께', 'Heat No.'를 포함하는 컬럼을 찾아 단일 이름으로 매핑
+        # 이 부분은 get_impact_data_with_multiheader가 단일 이름으로 잘 변환한다고 가정하고,
+        # process_impact_data에서 처리하도록 수정합니다.
+        
+        return df
+
+    except FileNotFoundError:
+        report_error(f"오류: '{filename}' 파일을 찾을 수 없습니다.")
+        return None
+    except Exception as e:
+        report_error(f"오류: '{filename}' 파일을 읽는 중 문제가 발생했습니다: {e}")
+        return None
+
+
+def compact_dtypes(df, category_cols=(), downcast=True):
+    """
+    [신규] 값은 그대로 두고 메모리를 덜 쓰는 타입으로 바꾸는 함수
+
+    - category_cols: 반복되는 문자열 컬럼 (고유값 비율이 DTYPE_CONFIG['category_max_ratio'] 이하이면 category)
+      문자열이 아닌 값이 섞인 컬럼은 그대로 둠
+    - downcast=True이면 정수 컬럼은 더 작은 정수 타입으로, 실수 컬럼은 float32로 바꿔도
+      모든 값이 같을 때만 float32로 변환 (엑셀에 쓰는 값은 바뀌지 않음)
+    """
+    if not DTYPE_CONFIG['enabled'] or df.empty:
+        return df
+    max_ratio = DTYPE_CONFIG['category_max_ratio']
+    for col in df.columns:
+        series = df[col]
+        if col in category_cols:
+            if (not isinstance(series.dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(series)
+                    and series.nunique() <= len(series) * max_ratio):
+                df[col] = series.astype('category')
+        elif not downcast:
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series) and series.dtype.itemsize > 4:
+            narrow = series.astype('float32')
+            if np.array_equal(narrow.to_numpy(dtype=float), series.to_numpy(dtype=float), equal_nan=True):
+                df[col] = narrow
+    return df
+
+
+def factorize_keys(df, key_cols):
+    """
+    [신규] 복합 키 컬럼을 하나의 정수 코드로 바꾸는 함수 (키 값이 비어 있지 않은 행만 전달)
+
+    반환: (행별 정수 코드 배열, 코드 순서의 복합 키 MultiIndex)
+    코드는 복합 키의 정렬 순서(groupby와 같음)이므로 코드로 정렬하면 키로 정렬한 것과 같음
+    """
+    grouped = df.groupby(key_cols, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    return codes, grouped.size().index
+
+
+def process_component_data(df):
+    """
+    [수정] 규칙 2: 성분 시험 데이터 처리 (복합 키 사용)
+    [v2.3] 그룹별 루프 대신 cumcount 순번 + 한 번의 pivot으로 벡터화
+    """
+    if df is None: return pd.DataFrame()
+    
+    # [수정] 복합 키로 사용할 컬럼 정의
+    base_key_cols = BASE_KEY_COLS
+    
+    # [수정] 키 컬럼이 모두 존재하는지 확인
+    if not all(col in df.columns for col in base_key_cols):
+        report_error(f"성분 시험 파일에 필수 키 컬럼({base_key_cols}) 중 일부가 없습니다.")
+        return pd.DataFrame()
+
+    # [신규] '시편배치'의 앞 8자리를 키로 사용
+    df['시편배치_키'] = df['시편배치'].str[:8]
+    key_cols = ['시편배치_키', '외경', '두께', 'Heat No.']
+
+    # 필요한 성분 컬럼 목록 (템플릿 기준)
+    comp_cols = COMPONENT_ELEMENT_COLS
+    
+    # [수정] 기본 정보 컬럼 (키 컬럼 제외, 원본 '시편배치' 추가)
+    info_cols = COMPONENT_INFO_COLS
+
+    # groupby와 동일하게 키 값이 비어 있는 행은 제외
+    keyed = df.dropna(subset=key_cols)
+    if keyed.empty:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[]] * len(key_cols), names=key_cols))
+
+    # [신규] 복합 키를 정수 코드로 바꿔 순번 계산과 pivot을 정수 키로 수행
+    codes, all_keys = factorize_keys(keyed, key_cols)
+
+    # 1. 그룹별 마지막 2개 행 선택 (뒤에서부터의 순번이 0, 1인 행)
+    from_end = pd.Series(codes).groupby(codes, sort=False).cumcount(ascending=False).to_numpy()
+    last_two = keyed[from_end < 2]
+    last_codes = codes[from_end < 2]
+    # 마지막 2개 행 안에서의 순번 (1 = 앞 행, 2 = 뒤 행 / 행이 1개면 1만 존재)
+    slot = pd.Series(last_codes).groupby(last_codes, sort=False).cumcount().to_numpy() + 1
+
+    # 2. 기본 정보 추출 (첫 번째 행에서만)
+    first_rows = last_two[slot == 1].set_index(pd.Index(last_codes[slot == 1], name=KEY_CODE_NAME))
+    info_df = pd.DataFrame(index=first_rows.index)
+    for col in info_cols:
+        # 기존 구현의 .get()과 같이 컬럼이 없으면 None
+        info_df[col] = first_rows[col] if col in first_rows.columns else None
+
+    # [신규] '시편배치' 값을 8자리 키 값으로 덮어쓰기 (v2.2)
+    info_df['시편배치'] = first_rows['시편배치_키']
+
+    # 3. 성분 데이터를 한 번에 pivot 하여 C_1 ... CEQ_2 형태로 변환
+    present_cols = [col for col in comp_cols if col in last_two.columns]
+    wide_index = [pd.Index(last_codes, name=KEY_CODE_NAME), pd.Index(slot, name='_순번')]
+    wide = last_two[present_cols].set_index(wide_index).unstack('_순번')
+    slots = sorted(wide.columns.get_level_values(1).unique())
+    ordered = [(col, s) for s in slots for col in present_cols]
+    wide = wide[ordered]
+    wide.columns = [f'{col}_{s}' for col, s in ordered]
+
+    # 코드 순서 = 복합 키 정렬 순서
+    result_df = info_df.join(wide).sort_index()
+    result_df.index = all_keys[result_df.index.to_numpy()]
+    # [수정] 인덱스 이름 설정
+    result_df.index.names = key_cols
+    return compact_dtypes(result_df, info_cols)
+
+
+def process_component_data_reference(df):
+    """
+    [참조용] 규칙 2의 기존 루프 구현 (그룹별 tail(2) + iterrows)
+    process_component_data의 결과와 동일한지 검증할 때 사용합니다.
+    """
+    if df is None: return pd.DataFrame()
+    
+    # [수정] 복합 키로 사용할 컬럼 정의
+    base_key_cols = ['시편배치', '외경', '두께', 'Heat No.']
+    
+    # [수정] 키 컬럼이 모두 존재하는지 확인
+    if not all(col in df.columns for col in base_key_cols):
+        report_error(f"성분 시험 파일에 필수 키 컬럼({base_key_cols}) 중 일부가 없습니다.")
+        return pd.DataFrame()
+
+    # [신규] '시편배치'의 앞 8자리를 키로 사용
+    df['시편배치_키'] = df['시편배치'].str[:8]
+    key_cols = ['시편배치_키', '외경', '두께', 'Heat No.']
+
+    # 필요한 성분 컬럼 목록 (템플릿 기준)
+    comp_cols = ['C', 'Si', 'Mn', 'P', 'S', 'Cu', 'Ni', 'Cr', 'Mo', 'V', 'Nb', 'Ti', 'Alsol', 'Aloxy', 'Al', 'Ca', 'B', 'PCM', 'CEQ']
+    
+    # [수정] 기본 정보 컬럼 (키 컬럼 제외, 원본 '시편배치' 추가)
+    info_cols = ['생산오더', '제품배치', '제품기호', '원재료기호', '원재료업체', '시편배치']
+    
+    processed_data = {}
+
+    # [수정] 복합 키로 그룹화
+    for key, group in df.groupby(key_cols):
+        last_two = group.tail(2)
+        
+        # 1. 기본 정보 추출 (첫 번째 행에서만)
+        # info_cols에 없는 컬럼이 있을 수 있으므로 .get() 사용
+        info_data = {col: last_two.iloc[0].get(col) for col in info_cols}
+
+        # [신규] '시편배치' 값을 8자리 키 값으로 덮어쓰기 (v2.2)
+        if '시편배치' in info_data:
+            info_data['시편배치'] = last_two.iloc[0].get('시편배치_키')
+
+        # 2. 성분 데이터 추출 및 컬럼명 변경
+        row_data = {}
+        for i, (idx, row) in enumerate(last_two.iterrows()):
+            suffix = f'_{i+1}' # _1, _2
+            for col in comp_cols:
+                if col in row:
+                    row_data[col + suffix] = row[col]
+        
+        processed_data[key] = {**info_data, **row_data}
+        
+    result_df = pd.DataFrame.from_dict(processed_data, orient='index')
+    # [수정] 인덱스 이름 설정
+    result_df.index.names = key_cols
+    return result_df
+
+
+def pivot_last_by_category(df, key_cols, category_col, categories, value_cols):
+    """
+    [신규] 복합 키 + 구분값(방향, Notch 위치 등)별 마지막 행만 남기고
+    '{구분값}_{컬럼}' 형태의 넓은 표로 한 번에 변환하는 함수
+
+    - 결과 인덱스는 df.groupby(key_cols)의 모든 키 (정렬된 순서)
+    - 구분값 행이 없는 키 또는 원본에 없는 컬럼은 None으로 채움
+    """
+    keyed = df.dropna(subset=key_cols)
+    # [신규] 복합 키를 정수 코드로 바꿔 마지막 행 선택과 pivot을 정수 키로 수행
+    codes, all_keys = factorize_keys(keyed, key_cols)
+
+    # 키 + 구분값 기준으로 마지막 시험만 유지
+    selected = keyed[category_col].isin(categories).to_numpy()
+    last = keyed[selected].assign(**{KEY_CODE_NAME: codes[selected]})
+    last = last.drop_duplicates(subset=[KEY_CODE_NAME, category_col], keep='last')
+    if isinstance(last[category_col].dtype, pd.CategoricalDtype):
+        # 없는 구분값이 unstack 결과 컬럼으로 생기지 않도록 사용하지 않는 category 제거
+        last[category_col] = last[category_col].cat.remove_unused_categories()
+
+    present_cols = [col for col in value_cols if col in last.columns]
+    wide = last.set_index([KEY_CODE_NAME, category_col])[present_cols].unstack(category_col)
+    wide = wide.reindex(range(len(all_keys)))
+    wide.index = all_keys
+
+    result_df = pd.DataFrame(index=all_keys)
+    for category in categories:
+        for col in value_cols:
+            if (col, category) in wide.columns:
+                values = wide[(col, category)]
+                if pd.api.types.is_integer_dtype(last[col]) and values.notna().all():
+                    # unstack 과정에서 float로 바뀐 정수 컬럼 복원
+                    values = values.astype(last[col].dtype)
+                elif values.dtype == object:
+                    # 해당 구분값의 시험이 없는 키는 기존 구현과 같이 NaN 대신 None
+                    tested = last.loc[last[category_col] == category, KEY_CODE_NAME].to_numpy()
+                    values = values.where(np.isin(np.arange(len(all_keys)), tested), None)
+                result_df[f"{category}_{col}"] = values
+            else:
+                result_df[f"{category}_{col}"] = None
+    # 기존 구현(DataFrame.from_dict)과 같은 dtype 추론 (예: 문자열만 있는 컬럼)
+    return result_df.infer_objects()
+
+
+def process_tensile_data(df):
+    """
+    [수정] 규칙 3: 인장 시험 데이터 처리 (복합 키 사용)
+    [v2.3] 키 + 방향 기준 마지막 행만 남긴 뒤 한 번의 pivot으로 벡터화
+    """
+    if df is None: return pd.DataFrame()
+
+    # [수정] 복합 키로 사용할 컬럼 정의
+    base_key_cols = BASE_KEY_COLS
+
+    # [수정] 키 컬럼이 모두 존재하는지 확인
+    if not all(col in df.columns for col in base_key_cols):
+        report_error(f"인장 시험 파일에 필수 키 컬럼({base_key_cols}) 중 일부가 없습니다.")
+        return pd.DataFrame()
+    
+    # [신규] '시편배치'의 앞 8자리를 키로 사용
+    df['시편배치_키'] = df['시편배치'].str[:8]
+    key_cols = ['시편배치_키', '외경', '두께', 'Heat No.']
+    
+    # 처리할 방향과 결과 컬럼 정의
+    directions = TENSILE_DIRECTIONS
+    result_cols = TENSILE_RESULT_COLS
+
+    result_df = pivot_last_by_category(df, key_cols, TENSILE_DIRECTION_COL, directions, result_cols)
+    # [수정] 인덱스 이름 설정
+    result_df.index.names = key_cols
+    return compact_dtypes(result_df)
+
+
+def process_tensile_data_reference(df):
+    """
+    [참조용] 규칙 3의 기존 루프 구현 (그룹 x 방향별 필터링)
+    process_tensile_data의 결과와 동일한지 검증할 때 사용합니다.
+    """
+    if df is None: return pd.DataFrame()
+
+    # [수정] 복합 키로 사용할 컬럼 정의
+    base_key_cols = ['시편배치', '외경', '두께', 'Heat No.']
+
+    # [수정] 키 컬럼이 모두 존재하는지 확인
+    if not all(col in df.columns for col in base_key_cols):
+        report_error(f"인장 시험 파일에 필수 키 컬럼({base_key_cols}) 중 일부가 없습니다.")
+        return pd.DataFrame()
+    
+    # [신규] '시편배치'의 앞 8자리를 키로 사용
+    df['시편배치_키'] = df['시편배치'].str[:8]
+    key_cols = ['시편배치_키', '외경', '두께', 'Heat No.']
+    
+    # 처리할 방향과 결과 컬럼 정의
+    directions = ["Stripe 모재 L방향", "Stripe 모재 T방향", "Stripe 용접"]
+    result_cols = ["YS2 STRESS", "TS STRESS", "연신율 EL(%)", "YR(%)"]
+    
+    all_data = {}
+
+    # [수정] 복합 키로 그룹화
+    for key, group in df.groupby(key_cols):
+        key_data = {}
+        for direction in directions:
+            dir_group = group[group['시편 위치/방향'] == direction]
+            if not dir_group.empty:
+                last_test = dir_group.iloc[-1]
+                for col in result_cols:
+                    # [수정] 컬럼이 없을 경우 None 반환
+                    key_data[f"{direction}_{col}"] = last_test.get(col, None)
+            else:
+                for col in result_cols:
+                    key_data[f"{direction}_{col}"] = None
+        all_data[key] = key_data
+        
+    result_df = pd.DataFrame.from_dict(all_data, orient='index')
+    # [수정] 인덱스 이름 설정
+    result_df.index.names = key_cols
+    return result_df
+
+
+def row_mode_smallest(values):
+    """
+    [신규] 2차원 배열의 행별 최빈값을 구하는 함수
+    NaN은 제외하고, 동률이면 가장 작은 값 (pd.Series.mode().iloc[0]과 동일), 값이 없으면 NaN
+    """
+    values = np.asarray(values, dtype=float)
+    if values.shape[1] == 0:
+        return np.full(values.shape[0], np.nan)
+    valid = ~np.isnan(values)
+    # 각 값이 같은 행 안에서 몇 번 나오는지 계산 (행 x 열)
+    counts = (values[:, :, None] == values[:, None, :]).sum(axis=2)
+    counts[~valid] = 0
+    candidates = valid & (counts == counts.max(axis=1, keepdims=True))
+    mode = np.where(candidates, values, np.inf).min(axis=1)
+    mode[~valid.any(axis=1)] = np.nan
+    return mode
+
+
+def numeric_values_only(series):
+    """
+    [신규] 숫자(int, float)인 값만 남기고 나머지(문자열, 빈 값 등)는 NaN으로 바꾼 배열을 반환하는 함수
+
+    [수정] 정수 컬럼(int64)의 값도 숫자로 봅니다 (의도한 변경).
+    기존 구현(process_impact_data_reference)은 isinstance(v, (int, float))로 걸렀는데,
+    np.int64는 int가 아니어서 에너지 값이 모두 정수인 컬럼은 *_Avg 평균에서 빠지고 None이 되었습니다.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=float)
+    is_number = series.map(lambda v: isinstance(v, (int, float)) and pd.notna(v)).to_numpy(dtype=bool)
+    return series.where(is_number, np.nan).to_numpy(dtype=float)
+
+
+def process_impact_data(df):
+    """
+    [수정] 규칙 4: 충격 시험 데이터 처리 (복합 키 사용)
+    [v2.3] 온도 최빈값, 에너지 평균을 전체 행에 대해 NumPy로 한 번에 계산한 뒤 pivot
+    """
+    if df is None: return pd.DataFrame()
+
+    # [수정] 동적으로 컬럼명 찾기 (정리된 컬럼명 기준)
+    # get_impact_data_with_multiheader 함수가 '시편배치_시편배치' -> '시편배치' 등으로
+    # 잘 정리해준다고 가정합니다.
+    specimen_col, od_col, thick_col, heat_col, notch_col = [find_column(df.columns, keyword) for keyword in IMPACT_KEY_KEYWORDS]
+
+    # [수정] 복합 키 컬럼 리스트
+    base_key_cols_found = [specimen_col, od_col, thick_col, heat_col]
+    
+    if not all(base_key_cols_found + [notch_col]):
+        report_error(f"충격 시험 파일에서 필수 키/Notch 컬럼을 찾을 수 없습니다. (찾은 컬럼: {base_key_cols_found}, {notch_col})")
+        return pd.DataFrame()
+
+    # [신규] '시편배치'의 앞 8자리를 키로 사용
+    df['시편배치_키'] = df[specimen_col].str[:8]
+    key_cols = ['시편배치_키', od_col, thick_col, heat_col] # [수정] specimen_col 대신 '시편배치_키' 사용
+    # [수정] 인덱스 이름도 통일
+    key_col_names = ['시편배치_키', '외경', '두께', 'Heat No.']
+
+
+    locations = IMPACT_LOCATIONS
+
+    # 1. 시험 온도: 6개 온도 컬럼의 행별 최빈값 (동률이면 가장 작은 값)
+    temp_cols = [col for col in IMPACT_TEMP_COLS if col in df.columns]
+    temp_block = df[temp_cols]
+    if all(pd.api.types.is_numeric_dtype(temp_block[col]) for col in temp_cols):
+        test_temperature = pd.Series(row_mode_smallest(temp_block.to_numpy(dtype=float)), index=df.index)
+        if temp_cols and all(pd.api.types.is_integer_dtype(temp_block[col]) for col in temp_cols):
+            test_temperature = test_temperature.astype('int64')
+    else:
+        # 숫자가 아닌 온도 값이 섞여 있으면 기존 방식(pd.Series.mode)으로 행별 계산
+        def mode_or_none(row):
+            mode_series = row.dropna().mode()
+            return mode_series.iloc[0] if not mode_series.empty else None
+        test_temperature = temp_block.apply(mode_or_none, axis=1)
+
+    # 2. 에너지 값과 평균: 숫자(int, float)인 값만 평균에 포함
+    # [수정] 정수(int64) 에너지 컬럼도 평균에 포함 (기존 구현과 다른 점, numeric_values_only 참고)
+    calc = df[key_cols + [notch_col]].copy()
+    calc['온도'] = test_temperature
+    energy_values = []
+    for i, col_name in enumerate(IMPACT_ENERGY_COLS, 1):
+        if col_name in df.columns:
+            calc[str(i)] = df[col_name]
+            energy_values.append(numeric_values_only(df[col_name]))
+    if energy_values:
+        energy_block = np.column_stack(energy_values)
+        valid_count = (~np.isnan(energy_block)).sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            calc['Avg'] = np.nansum(energy_block, axis=1) / valid_count
+    else:
+        calc['Avg'] = np.nan
+
+    # 3. 키 + Notch 위치별 마지막 시험을 Base/Weld/HAZ 넓은 표로 변환
+    result_df = pivot_last_by_category(calc, key_cols, notch_col, locations, ['온도', '1', '2', '3', 'Avg'])
+
+    # 기존 구현에서 온도/평균은 값이 없으면 NaN이 아닌 None
+    for loc in locations:
+        for col in [f'{loc}_온도', f'{loc}_Avg']:
+            if result_df[col].isna().all():
+                result_df[col] = None
+
+    # [수정] 인덱스 이름 설정
+    result_df.index.names = key_col_names
+    return compact_dtypes(result_df)
+
+
+def process_impact_data_reference(df):
+    """
+    [참조용] 규칙 4의 기존 루프 구현 (그룹 x Notch 위치별 필터링, 행마다 mode 계산)
+    process_impact_data의 결과와 동일한지 검증할 때 사용합니다.
+    단, 에너지 컬럼이 정수(int64)이면 여기서는 *_Avg가 None이고 process_impact_data는 평균을 계산합니다
+    (np.int64가 isinstance(v, int)에 걸리지 않던 문제를 고친 것, numeric_values_only 참고).
+    """
+    if df is None: return pd.DataFrame()
+
+    # [수정] 동적으로 컬럼명 찾기 (정리된 컬럼명 기준)
+    # get_impact_data_with_multiheader 함수가 '시편배치_시편배치' -> '시편배치' 등으로
+    # 잘 정리해준다고 가정합니다.
+    def find_col(df, keyword):
+        # 먼저 정확히 일치하는 이름 찾기
+        if keyword in df.columns:
+            return keyword
+        # 없다면 키워드를 포함하는 컬럼 찾기
+        for col in df.columns:
+            if keyword in col:
+                return col
+        return None
+
+    specimen_col = find_col(df, '시편배치')
+    od_col = find_col(df, '외경')
+    thick_col = find_col(df, '두께')
+    heat_col = find_col(df, 'Heat No.')
+    notch_col = find_col(df, 'Notch 위치')
+    
+    # [수정] 복합 키 컬럼 리스트
+    base_key_cols_found = [specimen_col, od_col, thick_col, heat_col]
+    
+    if not all(base_key_cols_found + [notch_col]):
+        report_error(f"충격 시험 파일에서 필수 키/Notch 컬럼을 찾을 수 없습니다. (찾은 컬럼: {base_key_cols_found}, {notch_col})")
+        return pd.DataFrame()
+
+    # [신규] '시편배치'의 앞 8자리를 키로 사용
+    df['시편배치_키'] = df[specimen_col].str[:8]
+    key_cols = ['시편배치_키', od_col, thick_col, heat_col] # [수정] specimen_col 대신 '시편배치_키' 사용
+    # [수정] 인덱스 이름도 통일
+    key_col_names = ['시편배치_키', '외경', '두께', 'Heat No.']
+
+
+    # 컬럼 접두사 정의
+    temp_col_prefix = '온도(˚C)'
+    energy_col_prefix = '에너지(J) SIZE 10보정'
+
+    locations = ["Base (Transeverse)", "Weld Line", "HAZ"]
+    all_data = {}
+    
+    # [수정] 복합 키로 그룹화
+    for key, group in df.groupby(key_cols):
+        key_data = {}
+        for loc in locations:
+            loc_group = group[group[notch_col] == loc]
+            
+            if not loc_group.empty:
+                last_test_row = loc_group.iloc[-1]
+                
+                temp_values = []
+                for i in range(1, 7):
+                    col_name = f'{temp_col_prefix}_{i}'
+                    if col_name in last_test_row and pd.notna(last_test_row[col_name]):
+                        temp_values.append(last_test_row[col_name])
+                
+                test_temperature = None
+                if temp_values:
+                    mode_series = pd.Series(temp_values).mode()
+                    if not mode_series.empty:
+                        test_temperature = mode_series.iloc[0]
+
+                val1 = last_test_row.get(f'{energy_col_prefix}_1', None)
+                val2 = last_test_row.get(f'{energy_col_prefix}_2', None)
+                val3 = last_test_row.get(f'{energy_col_prefix}_3', None)
+                
+                valid_values = [v for v in [val1, val2, val3] if pd.notna(v) and isinstance(v, (int, float))]
+                
+                key_data[f'{loc}_온도'] = test_temperature
+                key_data[f'{loc}_1'] = val1
+                key_data[f'{loc}_2'] = val2
+                key_data[f'{loc}_3'] = val3
+                key_data[f'{loc}_Avg'] = sum(valid_values) / len(valid_values) if valid_values else None
+            else:
+                for col in ['온도', '1', '2', '3', 'Avg']:
+                    key_data[f'{loc}_{col}'] = None
+        all_data[key] = key_data
+    
+    result_df = pd.DataFrame.from_dict(all_data, orient='index')
+    # [수정] 인덱스 이름 설정
+    result_df.index.names = key_col_names
+    return result_df
+
+
+# [신규] 시험 종류 이름 (캐시 키, 병렬 처리 등에서 사용)
+TEST_KINDS = ['component', 'tensile', 'impact']
+
+
+def read_test_data(kind, source, sheet_name=0):
+    """
+    [신규] 시험 종류('component', 'tensile', 'impact')에 맞는 방식으로 결과 파일을 읽는 함수
+    [신규] 반복되는 문자열 컬럼(RAW_CATEGORY_KEYWORDS)은 category로 바꿔 메모리 절약
+    """
+    if kind == 'component':
+        df = get_data(source, sheet_name=sheet_name, columns=COMPONENT_READ_COLS)
+    elif kind == 'tensile':
+        df = get_data(source, sheet_name=sheet_name, columns=TENSILE_READ_COLS)
+    elif kind == 'impact':
+        df = get_impact_data_with_multiheader(source, sheet_name=sheet_name)
+    else:
+        raise ValueError(f"알 수 없는 시험 종류입니다: {kind}")
+    if df is None:
+        return None
+    return compact_raw_frame(kind, df)
+
+
+def compact_raw_frame(kind, df):
+    """[신규] 원본의 반복 문자열 컬럼(RAW_CATEGORY_KEYWORDS)을 category로 바꾸는 함수"""
+    category_cols = [find_column(df.columns, keyword) for keyword in RAW_CATEGORY_KEYWORDS[kind]]
+    # 원본 숫자 타입은 증분 추가 모드의 입력 지문에 쓰이므로 그대로 둠
+    return compact_dtypes(df, [col for col in category_cols if col], downcast=False)
+
+
+def read_test_data_stored(kind, source, sheet_name=0):
+    """
+    [신규] 열 기반 중간 저장소(columnar_store)를 거쳐 결과 파일을 읽는 함수
+    같은 내용의 파일을 변환해 둔 적이 있으면 엑셀 대신 변환 파일을 메모리 맵으로 읽고,
+    처음 읽는 파일은 엑셀을 읽은 뒤 변환 파일로 저장
+    [신규] sheet_name: 읽을 시트 번호 (0부터, 첫 번째가 아닌 시트는 시트별로 따로 저장)
+    """
+    if not columnar_store.is_available():
+        return read_test_data(kind, source, sheet_name)
+    try:
+        digest = columnar_store.source_digest(source)
+    except OSError:
+        # 파일이 없는 경우 등은 read_test_data에서 오류 메시지 출력
+        return read_test_data(kind, source, sheet_name)
+
+    version = READ_FORMAT_VERSION if sheet_name == 0 else f"{READ_FORMAT_VERSION}-s{sheet_name}"
+    df = columnar_store.load(kind, digest, version)
+    if df is not None:
+        return df
+    df = read_test_data(kind, source, sheet_name)
+    if df is not None:
+        columnar_store.save(kind, digest, df, version)
+    return df
+
+
+def count_sheets(source):
+    """[신규] 엑셀 파일의 시트 수 (파일 객체는 처음 위치로 되돌림)"""
+    if hasattr(source, 'seek'): source.seek(0)
+    wb = openpyxl.load_workbook(source, read_only=True)
+    try:
+        return len(wb.sheetnames)
+    finally:
+        wb.close()
+        if hasattr(source, 'seek'): source.seek(0)
+
+
+def hash_normalized_number(value):
+    """[신규] 행 해시용으로 정수/실수 값을 float로 맞추는 함수 (그 외 값은 그대로)"""
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        return float(value)
+    return value
+
+
+def row_hashes(df):
+    """
+    [신규] 행별 해시 (컬럼 순서와 관계없이 같은 컬럼/값이면 같은 해시)
+    [수정] 숫자는 파일마다 정수/실수로 다르게 읽혀도(예: 508과 508.0) 같은 해시가 되도록 float로 맞춤
+    """
+    columns = {}
+    for col in sorted(df.columns, key=str):
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype('float64')
+        elif values.dtype == object:
+            values = values.map(hash_normalized_number)
+        columns[col] = values
+    return pd.util.hash_pandas_object(pd.DataFrame(columns, index=df.index), index=False).to_numpy()
+
+
+def drop_repeated_rows(df, order):
+    """
+    [신규] 앞의 파일(시트)에 이미 있는 행을 버리는 함수
+    - order: 행별 파일(시트) 순번
+    값이 같은 행 중 처음 나온 파일(시트)의 행만 남기며, 같은 파일(시트) 안의 같은 행은 그대로 둠
+    """
+    first_order = pd.Series(order).groupby(row_hashes(df)).transform('min').to_numpy()
+    return df[order == first_order].reset_index(drop=True)
+
+
+def iter_source_sheets(sources, all_sheets=False):
+    """
+    [신규] 한 시험 종류의 파일 목록에서 읽을 (파일, 시트 번호, 그 파일의 시트 수)를 차례로 돌려주는 함수
+
+    - sources: 파일 경로/파일 객체/bytes 하나 또는 목록 (bytes는 파일 객체로 바꿈)
+    - all_sheets=False이면 파일마다 첫 번째 시트만
+    """
+    if not isinstance(sources, (list, tuple)):
+        sources = [sources]
+    for source in sources:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        sheets = [0]
+        if all_sheets:
+            try:
+                sheets = range(count_sheets(source))
+            except Exception:
+                # 열 수 없는 파일은 읽는 쪽에서 오류 메시지 출력
+                pass
+        for sheet_name in sheets:
+            yield source, sheet_name, len(sheets)
+
+
+def read_test_sources(kind, sources, all_sheets=False):
+    """
+    [신규] 한 시험 종류의 여러 파일(시트)을 차례로 읽어 하나의 원본 DataFrame으로 합치는 함수
+
+    - sources: 파일 경로/파일 객체/bytes 하나 또는 목록 (목록 순서 = 시험 순서)
+    - all_sheets=True이면 각 파일의 모든 시트를 차례로 읽음
+    파일(시트)을 하나씩 읽을 때마다 앞의 파일(시트)에서 이미 읽은 행과 값이 모두 같은 행
+    (겹치는 기간의 중복 내보내기)은 버리고, 한 시트 안의 같은 행은 그대로 둠
+    (중복을 뺀 뒤에 규칙 2~4의 '마지막 2개 행 / 마지막 시험'이 적용됨)
+    [수정] 중복 확인은 모두 합친 뒤에 하므로 파일마다 타입 추론이 달라도 같은 행을 찾음
+    하나라도 읽지 못하면 None
+    """
+    frames = []
+    for source, sheet_name, sheet_count in iter_source_sheets(sources, all_sheets):
+        df = read_test_data_stored(kind, source, sheet_name)
+        if df is None:
+            return None
+        if sheet_count > 1 and len(df.columns) == 0:
+            # 필요한 컬럼이 하나도 없는 시트(메모 등)는 건너뜀
+            continue
+        frames.append(df)
+
+    if not frames:
+        report_error(f"오류: {kind} 시험 결과 파일에서 읽을 수 있는 시트가 없습니다.")
+        return None
+    if len(frames) == 1:
+        return frames[0]
+    order = np.repeat(np.arange(len(frames)), [len(df) for df in frames])
+    df = drop_repeated_rows(pd.concat(frames, ignore_index=True), order)
+    # 파일마다 category 값이 달라 object로 바뀐 컬럼은 다시 category로
+    return compact_raw_frame(kind, df)
+
+
+def process_test_data(kind, df):
+    """[신규] 시험 종류에 맞는 처리 함수(규칙 2~4)를 호출하는 함수"""
+    if kind == 'component':
+        return process_component_data(df)
+    if kind == 'tensile':
+        return process_tensile_data(df)
+    if kind == 'impact':
+        return process_impact_data(df)
+    raise ValueError(f"알 수 없는 시험 종류입니다: {kind}")
+
+
+def read_and_process(kind, source, raw_df=None, return_raw=False, process=True, all_sheets=False):
+    """
+    [신규] 한 종류의 시험 파일을 읽고 처리하는 함수 (병렬 실행 단위)
+
+    - source: 파일 경로, 파일 객체 또는 파일 내용(bytes), 또는 그 목록 (read_test_sources 참고)
+    - all_sheets=True이면 각 파일의 모든 시트를 읽음
+    - raw_df: 이미 읽어 둔 원본이 있으면 읽기 단계를 건너뜀
+    - 반환: (원본 DataFrame 또는 None, 처리된 DataFrame, 오류 메시지 목록)
+      읽기에 실패하면 원본은 None, 처리 결과는 빈 DataFrame
+      return_raw=False이면 원본 대신 읽기 성공 여부(True/None)를 반환 (프로세스 간 전송량 절약)
+    - process=False이면 읽기만 하고 처리 결과는 None (증분 추가 모드에서 사용)
+    - [신규] 네 번째 값은 읽기/처리 단계별 계측 기록 (PipelineProfile.extend로 합침)
+    """
+    profile = PipelineProfile()
+    with collect_errors() as messages:
+        if raw_df is None:
+            with profile.stage(f'read_{kind}') as record:
+                raw_df = read_test_sources(kind, source, all_sheets)
+                record['rows_out'] = None if raw_df is None else len(raw_df)
+        if not process:
+            processed_df = None
+        elif raw_df is None:
+            processed_df = pd.DataFrame()
+        else:
+            with profile.stage(f'process_{kind}', rows_in=len(raw_df)) as record:
+                # 처리 함수가 원본에 '시편배치_키' 컬럼을 추가하므로 얕은 복사본을 전달
+                processed_df = process_test_data(kind, raw_df.copy(deep=False))
+                record['rows_out'] = len(processed_df)
+    if not return_raw and raw_df is not None:
+        raw_df = True
+    return raw_df, processed_df, messages, profile.records
+
+
+# [신규] Streamlit 서버처럼 오래 실행되는 프로세스에서 재사용하는 프로세스 풀
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _submit_to_process_pool(func, args_list):
+    """
+    [수정] 공유 프로세스 풀에 작업들을 넣고 (풀, future 목록)을 반환하는 함수
+
+    풀은 처음 한 번 PARALLEL_CONFIG['max_workers'] 크기로 만들고 호출마다 크기를 바꾸지 않음
+    (새 풀의 작업 프로세스는 pandas, openpyxl 등을 다시 불러오므로 느림)
+    다른 작업이 중간에 풀을 바꾸지 못하도록 잠금 안에서 작업을 넣음
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            context = multiprocessing.get_context(PARALLEL_CONFIG['start_method'])
+            _process_pool = ProcessPoolExecutor(max_workers=max(PARALLEL_CONFIG['max_workers'], 1),
+                                                mp_context=context)
+        try:
+            return _process_pool, [_process_pool.submit(func, *args) for args in args_list]
+        except BrokenProcessPool:
+            # 이전 작업에서 이미 깨진 풀이면 버리고 호출한 쪽에서 스레드로 실행
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+            raise
+
+
+def _discard_process_pool(pool):
+    """[수정] 깨진 풀을 버리는 함수 (다른 작업이 이미 새 풀로 바꿨으면 새 풀은 그대로 둠)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+
+def run_in_parallel(func, args_list, max_workers=None, use_processes=None, on_result=None):
+    """
+    [신규] func(*args)들을 동시에 실행하고 결과를 입력 순서대로 반환하는 함수
+
+    - 작업 수나 max_workers가 1 이하이면 순차 실행
+    - [수정] 프로세스는 서버 프로세스 전체가 공유하는 풀(크기 PARALLEL_CONFIG['max_workers'])에서 실행
+    - 프로세스 풀을 만들 수 없거나 중간에 깨지면 스레드 풀로 다시 실행 (이미 받은 결과는 다시 실행하지 않음)
+      깨진 풀은 버리고 다음 호출에서 새로 만듦
+    - [신규] on_result(순번, 결과): 결과가 나오는 대로 입력 순서대로 호출 (진행 상황 표시용)
+      예외를 내면 아직 시작하지 않은 작업은 취소하고 그 예외를 그대로 냄 (작업 취소에 사용)
+    """
+    max_workers = PARALLEL_CONFIG['max_workers'] if max_workers is None else max_workers
+    use_processes = PARALLEL_CONFIG['use_processes'] if use_processes is None else use_processes
+    workers = min(max_workers, len(args_list))
+    results = []
+
+    def collect(result):
+        if on_result is not None:
+            on_result(len(results), result)
+        results.append(result)
+
+    if workers <= 1:
+        for args in args_list:
+            collect(func(*args))
+        return results
+
+    if use_processes:
+        pool = None
+        try:
+            pool, futures = _submit_to_process_pool(func, args_list)
+            _collect_futures(futures, collect)
+            return results
+        except BrokenProcessPool as e:
+            print(f"프로세스 풀이 중단되어 스레드로 실행합니다: {e}")
+            if pool is not None:
+                _discard_process_pool(pool)
+        except (OSError, NotImplementedError, pickle.PicklingError) as e:
+            print(f"프로세스 풀을 사용할 수 없어 스레드로 실행합니다: {e}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        _collect_futures([pool.submit(func, *args) for args in args_list[len(results):]], collect)
+    return results
+
+
+def _collect_futures(futures, collect):
+    """future 결과를 순서대로 collect에 넘기고, 중간에 예외가 나면 남은 작업을 취소하는 함수"""
+    try:
+        for future in futures:
+            collect(future.result())
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def read_and_process_all(sources, max_workers=None, use_processes=None, profile=None, all_sheets=False):
+    """
+    [신규] 성분/인장/충격 파일을 동시에 읽고 처리하는 함수
+
+    - sources: {'component': 경로/파일 객체/bytes (또는 그 목록), 'tensile': ..., 'impact': ...}
+    - all_sheets=True이면 각 파일의 모든 시트를 읽음
+    - 반환: {종류: 처리된 DataFrame} (읽기에 실패한 종류는 None)
+    - profile: PipelineProfile을 넘기면 종류별 읽기/처리 단계 기록을 추가
+    결과는 실행 순서와 관계없이 순차 실행과 동일하며, 오류 메시지도 종류 순서대로 출력
+    """
+    kinds = list(sources)
+    args_list = [(kind, sources[kind], None, False, True, all_sheets) for kind in kinds]
+    results = {}
+
+    def on_result(i, output):
+        # [수정] 종류별 결과가 나오는 대로 기록을 추가하고, 다음 종류를 기다리기 전에 시작을 알림
+        raw_ok, processed_df, messages, records = output
+        for message in messages:
+            report_error(message)
+        if profile is not None:
+            profile.extend(records)
+            if i + 1 < len(kinds):
+                profile.start(f'read_{kinds[i + 1]}')
+        results[kinds[i]] = processed_df if raw_ok is not None else None
+
+    if profile is not None and kinds:
+        profile.start(f'read_{kinds[0]}')
+    run_in_parallel(read_and_process, args_list, max_workers=max_workers, use_processes=use_processes,
+                    on_result=on_result)
+    return results
+
+
+def encode_composite_keys(frames):
+    """
+    [신규] 복합 키(MultiIndex) 인덱스를 가진 처리 결과들의 키를 공용 정수 코드로 바꾸는 함수
+
+    반환: (정수 코드 인덱스로 바꾼 DataFrame 목록, 코드 순서의 복합 키 MultiIndex)
+    코드는 모든 키의 합집합을 정렬한 순서이므로, 코드 순서는 복합 키 기준 outer join 결과의
+    행 순서와 같음 (입력 DataFrame은 바꾸지 않음)
+    """
+    all_keys = frames[0].index
+    for df in frames[1:]:
+        all_keys = all_keys.union(df.index)
+    encoded = []
+    for df in frames:
+        df = df.copy(deep=False)
+        df.index = pd.Index(all_keys.get_indexer(df.index), name=KEY_CODE_NAME)
+        encoded.append(df)
+    return encoded, all_keys
+
+
+def assemble_final_dataframe(processed_comp, processed_tens, processed_impa,
+                             template_cols=TEMPLATE_ORDERED_COLS, return_keys=False):
+    """
+    [신규] 성분/인장/충격 처리 결과를 복합 키의 합집합 기준으로 한 번에 맞춰
+    템플릿 컬럼 순서의 최종 DataFrame을 바로 만드는 함수
+
+    기존의 join 두 번 + reset_index + 템플릿 순서 재정렬과 같은 결과이지만,
+    중간 병합 DataFrame 없이 템플릿 컬럼마다 원본 컬럼에서 한 번만 값을 가져와 만듦
+    [수정] 처리 결과의 키는 encode_composite_keys의 공용 정수 코드(= 최종 행 위치)로 맞춤
+    - 키 컬럼(외경, 두께, Heat No.)은 복합 키 값, 나머지는 해당 컬럼이 있는 처리 결과에서 가져옴
+    - 키가 없는 행은 빈 값(NaN), 어느 처리 결과에도 없는 컬럼은 None
+    - return_keys=True이면 (DataFrame, 행 순서의 복합 키 MultiIndex)를 반환
+    """
+    frames, all_keys = encode_composite_keys([processed_comp, processed_tens, processed_impa])
+    key_count = len(all_keys)
+
+    # 처리 결과별로 최종 행 위치(키 코드) -> 원본 행 위치 (키가 없으면 -1)
+    sources = {}
+    for df in frames:
+        positions = np.full(key_count, -1, dtype=np.intp)
+        positions[df.index.to_numpy()] = np.arange(len(df))
+        for col in df.columns:
+            sources.setdefault(col, (df, positions))
+
+    columns = {}
+    for col in template_cols:
+        if col in all_keys.names:
+            columns[col] = all_keys.get_level_values(col).array
+        elif col in sources:
+            df, positions = sources[col]
+            columns[col] = pd.api.extensions.take(df[col].array, positions, allow_fill=True)
+        else:
+            # 템플릿에 필요한 컬럼이 처리 결과에 없으면 빈 컬럼
+            columns[col] = np.full(key_count, None, dtype=object)
+    # copy=False: 컬럼 배열을 합치지(복사하지) 않고 그대로 사용
+    final_df_ordered = pd.DataFrame(columns, index=pd.RangeIndex(key_count), copy=False)
+    if return_keys:
+        return final_df_ordered, all_keys
+    return final_df_ordered
+
+
+# --- [신규] 양식 파일 캐시 ---
+
+# 셀 서식 6가지 (copy_cell_style이 복사하는 속성과 같은 이름)
+CellStyle = namedtuple('CellStyle', ['font', 'border', 'fill', 'number_format', 'protection', 'alignment'])
+
+
+def read_cell_style(cell):
+    """셀 서식 6가지를 CellStyle로 읽는 함수 (서식이 없는 셀은 None)"""
+    if not cell.has_style:
+        return None
+    return CellStyle(cell.font, cell.border, cell.fill, cell.number_format, cell.protection, cell.alignment)
+
+
+# [신규] 스트리밍 쓰기에서 양식 시트마다 그대로 옮기는 시트 설정
+# (틀 고정 등 시트 보기, 조건부 서식, 데이터 유효성 검사, 인쇄 설정, 시트 보호, 시트 범위 이름 등)
+SHEET_SETTING_ATTRS = [
+    'views', 'sheet_properties', 'sheet_format', 'sheet_state', 'protection', 'auto_filter',
+    'conditional_formatting', 'data_validations', 'defined_names',
+    'print_options', 'page_margins', 'HeaderFooter', 'row_breaks', 'col_breaks',
+]
+# 인쇄 제목 행/열, 인쇄 영역 (문자열로 옮김)
+SHEET_PRINT_ATTRS = ['print_title_rows', 'print_title_cols', 'print_area']
+
+
+class TemplateSheet:
+    """
+    [신규] 한 번 읽어 둔 양식 시트 하나 (ParsedTemplate.sheets)
+    기존 행의 값/서식, 열 너비, 행 높이, 병합 셀과 시트 설정(SHEET_SETTING_ATTRS)을 보관
+    """
+
+    def __init__(self, ws):
+        self.title = ws.title
+        self.max_row = ws.max_row
+        self.column_dimensions = [(key, dim.width, dim.hidden, dim.min, dim.max)
+                                  for key, dim in ws.column_dimensions.items()]
+        self.row_heights = {row_num: dim.height for row_num, dim in ws.row_dimensions.items() if dim.height is not None}
+        self.merged_ranges = [merged_range.coord for merged_range in ws.merged_cells.ranges]
+        self.settings = {attr: deepcopy(getattr(ws, attr)) for attr in SHEET_SETTING_ATTRS}
+        self.page_setup = copy(ws.page_setup)
+        self.print_settings = {attr: getattr(ws, attr) for attr in SHEET_PRINT_ATTRS}
+        # 양식의 기존 행(헤더 등): 행마다 (값, 서식) 목록
+        self.rows = [[(cell.value, read_cell_style(cell)) for cell in row]
+                     for row in ws.iter_rows(min_row=1, max_row=self.max_row)]
+
+    def copy_to(self, ws):
+        """write-only 시트에 서식/설정과 기존 행을 옮기는 함수 (데이터 행은 그 뒤에 추가)"""
+        # 행/열 서식 정보는 행을 쓰기 전에 지정해야 함
+        for key, width, hidden, min_col, max_col in self.column_dimensions:
+            ws.column_dimensions[key] = ColumnDimension(ws, index=key, width=width, hidden=hidden,
+                                                        min=min_col, max=max_col)
+        for row_num, height in self.row_heights.items():
+            ws.row_dimensions[row_num].height = height
+        for coord in self.merged_ranges:
+            ws.merged_cells.add(coord)
+        # 저장할 때 설정 객체가 바뀔 수 있으므로(조건부 서식의 서식 번호 등) 실행마다 복사본 사용
+        for attr, value in self.settings.items():
+            setattr(ws, attr, deepcopy(value))
+        ws.page_setup = copy(self.page_setup)
+        ws.page_setup._parent = ws
+        for attr, value in self.print_settings.items():
+            if value:
+                setattr(ws, attr, value)
+
+        for template_row in self.rows:
+            cells = []
+            for value, style in template_row:
+                cell = WriteOnlyCell(ws, value=value)
+                if style is not None:
+                    copy_cell_style(style, cell)
+                cells.append(cell)
+            ws.append(cells)
+
+
+class ParsedTemplate:
+    """
+    [신규] 한 번 읽어 둔 양식 파일 (get_template으로 생성)
+
+    스트리밍 쓰기에 필요한 정보(시트별 기존 행의 값/서식, 열 너비, 행 높이, 병합 셀, 시트 설정,
+    스타일 템플릿 행의 컬럼별 서식)는 미리 꺼내 두고,
+    일반 쓰기에 사용할 워크북은 pickle로 보관했다가 new_workbook()에서 복제합니다.
+    (pickle 복원이 엑셀 XML을 다시 읽는 openpyxl.load_workbook보다 빠름)
+    """
+
+    def __init__(self, data):
+        wb = openpyxl.load_workbook(io.BytesIO(data))
+        # 셀을 읽으면 빈 셀이 시트에 추가될 수 있으므로, 아무것도 읽기 전에 워크북을 보관
+        try:
+            self._workbook_pickle = pickle.dumps(wb)
+            self._data = None
+        except Exception:
+            # pickle할 수 없는 개체(그림 등)가 있으면 실행마다 원본 내용으로 다시 읽음
+            self._workbook_pickle = None
+            self._data = data
+
+        # [수정] 데이터를 쓰는 활성 시트뿐 아니라 모든 시트와 통합 문서 범위 이름을 보관
+        self.sheets = [TemplateSheet(sheet) for sheet in wb.worksheets]
+        self.active_index = wb.worksheets.index(wb.active)
+        self.defined_names = deepcopy(wb.defined_names)
+
+        ws = wb.active
+        self.max_row = ws.max_row
+        # 서식을 복사할 템플릿 행 (기존 데이터의 마지막 행)
+        self.style_template_row = ws.max_row if ws.max_row >= TEMPLATE_HEADER_ROW else TEMPLATE_HEADER_ROW
+        # TEMPLATE_ORDERED_COLS의 컬럼별 데이터 행 서식
+        self.column_styles = [read_cell_style(ws.cell(row=self.style_template_row, column=col_num))
+                              for col_num in range(1, len(TEMPLATE_ORDERED_COLS) + 1)]
+
+    def new_workbook(self):
+        """실행마다 새로 쓸 수 있는 양식 워크북 복제본을 반환"""
+        if self._workbook_pickle is None:
+            return openpyxl.load_workbook(io.BytesIO(self._data))
+        return pickle.loads(self._workbook_pickle)
+
+
+_template_cache = OrderedDict()  # 내용 해시 -> ParsedTemplate
+_template_cache_lock = threading.Lock()
+
+
+def get_template(source):
+    """
+    [신규] 양식 파일을 내용(SHA-256) 기준으로 한 번만 읽어 ParsedTemplate으로 반환하는 함수
+    - source: 파일 경로, bytes 또는 파일 객체
+    같은 내용의 양식은 다시 읽지 않고 캐시된 ParsedTemplate을 사용합니다. (TEMPLATE_CACHE_CONFIG)
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    elif hasattr(source, 'read'):
+        data = source.read()
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    with _template_cache_lock:
+        template = _template_cache.get(digest)
+        if template is not None:
+            _template_cache.move_to_end(digest)
+            return template
+
+    template = ParsedTemplate(data)
+    with _template_cache_lock:
+        _template_cache[digest] = template
+        while len(_template_cache) > TEMPLATE_CACHE_CONFIG['max_entries']:
+            _template_cache.popitem(last=False)
+    return template
+
+
+def load_template_workbook(source):
+    """[신규] 양식 파일로 데이터를 쓸 워크북을 여는 함수 (캐시된 양식의 복제본)"""
+    return get_template(source).new_workbook()
+
+
+def resolve_column_styles(ws, style_template_row, total_cols):
+    """
+    [신규] 스타일 템플릿 행의 서식을 컬럼별로 한 번만 읽어
+    워크북 공용 스타일 테이블의 번호(StyleArray)로 만들어 두는 함수
+
+    기존 구현에서 복사하던 6가지(font, border, fill, number_format, protection, alignment)만
+    그대로 가져오며, 서식이 없는 셀은 None
+    """
+    column_styles = []
+    for col_num in range(1, total_cols + 1):
+        template_cell = ws.cell(row=style_template_row, column=col_num)
+        if not template_cell.has_style:
+            column_styles.append(None)
+            continue
+        source = template_cell._style
+        style = StyleArray()
+        style.fontId = source.fontId
+        style.borderId = source.borderId
+        style.fillId = source.fillId
+        style.numFmtId = source.numFmtId
+        style.protectionId = source.protectionId
+        style.alignmentId = source.alignmentId
+        column_styles.append(style)
+    return column_styles
+
+
+def iter_row_values(final_df_ordered, chunk_rows=STREAMING_CHUNK_ROWS):
+    """
+    [신규] DataFrame을 (인덱스, 행 값 배열) 형태로 한 행씩 돌려주는 함수
+    빈 값(NaN)은 None으로 바꾸며, 변환은 chunk_rows 행 단위로 나눠서 수행
+    """
+    for start in range(0, len(final_df_ordered), chunk_rows):
+        chunk = final_df_ordered.iloc[start:start + chunk_rows]
+        values = chunk.astype(object).where(chunk.notna(), None).to_numpy()
+        yield from zip(chunk.index, values)
+
+
+def write_data_to_excel(wb, final_df_ordered, rows=None):
+    """
+    [신규] 준비된 DataFrame을 템플릿 엑셀 워크북에
+    서식을 복사하며 쓰는 함수
+    [v2.3] 템플릿 행의 서식은 컬럼별로 한 번만 읽고, 각 셀에는 공용 스타일 번호만 지정
+    [신규] rows: 데이터 행마다 쓸 엑셀 행 번호 목록 (None이면 기존 데이터 다음 행부터 차례로)
+    """
+    try:
+        ws = wb.active
+    except Exception as e:
+        report_error(f"엑셀 워크북에서 활성 시트를 찾는 중 오류 발생: {e}")
+        return None
+
+    # 데이터 쓰기 시작할 행 (기존 데이터 다음 행)
+    start_row = ws.max_row + 1
+    # 서식을 복사할 템플릿 행 (기존 데이터의 마지막 행)
+    style_template_row = ws.max_row if ws.max_row >= TEMPLATE_HEADER_ROW else TEMPLATE_HEADER_ROW
+    
+    # [수정] 템플릿 헤더의 총 컬럼 수 (서식 복사 기준)
+    # TEMPLATE_ORDERED_COLS 리스트의 길이를 사용
+    total_template_cols = len(TEMPLATE_ORDERED_COLS)
+    column_styles = resolve_column_styles(ws, style_template_row, total_template_cols)
+
+    data_cols = final_df_ordered.shape[1]
+    total_cols = max(data_cols, total_template_cols)
+
+    for position, (index, row_values) in enumerate(iter_row_values(final_df_ordered)):
+        current_row = start_row + index if rows is None else rows[position]
+        for col_idx in range(1, total_cols + 1):
+            value = row_values[col_idx - 1] if col_idx <= data_cols else None
+            cell = ws.cell(row=current_row, column=col_idx, value=value)
+            style = column_styles[col_idx - 1] if col_idx <= total_template_cols else None
+            if style is not None:
+                cell._style = copy(style)
+    
+    return wb
+
+
+def copy_cell_style(source_cell, target_cell):
+    """
+    [신규] 셀 서식 6가지(font, border, fill, number_format, protection, alignment)를 복사하는 함수
+    source_cell은 셀 또는 CellStyle
+    """
+    target_cell.font = copy(source_cell.font)
+    target_cell.border = copy(source_cell.border)
+    target_cell.fill = copy(source_cell.fill)
+    target_cell.number_format = copy(source_cell.number_format)
+    target_cell.protection = copy(source_cell.protection)
+    target_cell.alignment = copy(source_cell.alignment)
+
+
+def write_data_to_excel_streaming(template_file, final_df_ordered, output=None):
+    """
+    [신규] 대용량 결과용 스트리밍 쓰기 함수 (openpyxl write-only 모드)
+
+    양식 파일의 기존 행(헤더 포함)과 열 너비, 행 높이, 병합 셀, 틀 고정을 그대로 옮긴 뒤
+    데이터 행은 스타일 템플릿 행의 서식으로 한 줄씩 파일에 바로 기록합니다.
+    [수정] 양식의 다른 시트, 조건부 서식, 데이터 유효성 검사, 인쇄 제목/영역 등 시트 설정
+    (SHEET_SETTING_ATTRS)과 이름 정의도 옮기지만, 그림/차트/메모(셀 코멘트)/하이퍼링크는 옮기지 않음
+    [수정] 양식은 get_template으로 캐시된 정보를 사용 (같은 양식이면 다시 읽지 않음)
+    결과 워크북을 메모리에 만들지 않으므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+
+    - template_file: 양식 파일 경로, bytes, 파일 객체 또는 ParsedTemplate
+    - final_df_ordered: 템플릿 순서의 DataFrame [신규] 또는 DataFrame 조각의 반복자 (분할 처리 모드, 차례로 기록)
+    - output: 저장할 경로 또는 파일 객체 (None이면 임시 파일을 만들어 경로를 반환)
+    """
+    try:
+        template = template_file if isinstance(template_file, ParsedTemplate) else get_template(template_file)
+    except Exception as e:
+        report_error(f"템플릿 파일을 여는 중 오류가 발생했습니다: {e}")
+        return None
+
+    wb = openpyxl.Workbook(write_only=True)
+
+    # 1-2. [수정] 양식의 시트를 순서대로 옮김 (서식/설정은 행보다 먼저 지정해야 하므로 copy_to에서 함께 처리)
+    for index, sheet in enumerate(template.sheets):
+        target = wb.create_sheet(sheet.title)
+        sheet.copy_to(target)
+        if index == template.active_index:
+            ws = target
+    wb.active = template.active_index
+    for name, defined_name in template.defined_names.items():
+        wb.defined_names[name] = deepcopy(defined_name)
+
+    # 3. 스타일 템플릿 행의 서식을 컬럼별로 한 번만 새 워크북에 등록
+    total_template_cols = len(TEMPLATE_ORDERED_COLS)
+    column_styles = []
+    for style in template.column_styles:
+        if style is None:
+            column_styles.append(None)
+            continue
+        prototype = WriteOnlyCell(ws)
+        copy_cell_style(style, prototype)
+        column_styles.append(prototype._style)
+
+    # 4. 데이터 행을 한 줄씩 기록
+    frames = [final_df_ordered] if isinstance(final_df_ordered, pd.DataFrame) else final_df_ordered
+    for frame in frames:
+        data_cols = frame.shape[1]
+        total_cols = max(data_cols, total_template_cols)
+        for _, row_values in iter_row_values(frame):
+            cells = []
+            for col_idx in range(total_cols):
+                value = row_values[col_idx] if col_idx < data_cols else None
+                style = column_styles[col_idx] if col_idx < total_template_cols else None
+                if style is None:
+                    cells.append(value)
+                    continue
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = copy(style)
+                cells.append(cell)
+            ws.append(cells)
+
+    if output is None:
+        fd, output = tempfile.mkstemp(prefix='통합_시험_결과_', suffix='.xlsx')
+        os.close(fd)
+    wb.save(output)
+    return output
+
+
+def write_data_to_excel_reference(wb, final_df_ordered):
+    """
+    [참조용] 기존 엑셀 쓰기 구현 (셀마다 서식 객체 6종을 복사)
+    write_data_to_excel과 결과/속도를 비교할 때 사용합니다.
+    """
+    try:
+        ws = wb.active
+    except Exception as e:
+        report_error(f"엑셀 워크북에서 활성 시트를 찾는 중 오류 발생: {e}")
+        return None
+
+    # 데이터 쓰기 시작할 행 (기존 데이터 다음 행)
+    start_row = ws.max_row + 1
+    # 서식을 복사할 템플릿 행 (기존 데이터의 마지막 행)
+    style_template_row = ws.max_row if ws.max_row >= TEMPLATE_HEADER_ROW else TEMPLATE_HEADER_ROW
+    
+    # [수정] 템플릿 헤더의 총 컬럼 수 (서식 복사 기준)
+    # TEMPLATE_ORDERED_COLS 리스트의 길이를 사용
+    total_template_cols = len(TEMPLATE_ORDERED_COLS)
+
+    for index, row_data in final_df_ordered.iterrows():
+        current_row = start_row + index
+        
+        # [수정] 순서가 보장된 final_df_ordered의 값을 순서대로 입력
+        for col_idx, value in enumerate(row_data.values, 1):
+            if pd.isna(value):
+                value = None
+            ws.cell(row=current_row, column=col_idx, value=value)
+
+        # 서식 복사
+        for col_num in range(1, total_template_cols + 1):
+            template_cell = ws.cell(row=style_template_row, column=col_num)
+            if not template_cell:
+                continue
+                
+            new_cell = ws.cell(row=current_row, column=col_num)
+            
+            if template_cell.has_style:
+                new_cell.font = copy(template_cell.font)
+                new_cell.border = copy(template_cell.border)
+                new_cell.fill = copy(template_cell.fill)
+                new_cell.number_format = copy(template_cell.number_format)
+                new_cell.protection = copy(template_cell.protection)
+                new_cell.alignment = copy(template_cell.alignment)
+    
+    return wb
+
+
+# --- 증분 추가 모드 ---
+
+# 결과 행에서 복합 키를 이루는 컬럼 ('시편배치'는 8자리 키 값)
+RESULT_KEY_COLS = ['시편배치', '외경', '두께', 'Heat No.']
+
+
+def normalize_cell_value(value):
+    """
+    [신규] 키/지문 비교용으로 값을 정규화하는 함수
+    엑셀에 쓴 값과 다시 읽은 값이 같도록 숫자는 float, 빈 값은 None, 나머지는 문자열로 통일
+    [수정] 엑셀은 숫자를 유효숫자 15자리로 저장하므로 float도 15자리로 맞춤
+    (예: 141.83333333333334를 쓰면 141.8333333333333으로 다시 읽힘)
+    """
+    # 대부분의 값(빈 값, 문자열, float)을 먼저 확인
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return None if np.isnan(value) else float(f"{value:.15g}")
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = float(value)
+        return None if np.isnan(value) else float(f"{value:.15g}")
+    return str(value)
+
+
+def row_fingerprint(values):
+    """[신규] 결과 행 값 목록의 지문 (양식에 있는 행이 마지막으로 쓴 행과 같은지 확인)"""
+    normalized = tuple(normalize_cell_value(value) for value in values)
+    return hashlib.sha1(repr(normalized).encode('utf-8')).hexdigest()
+
+
+def raw_key_frame(df):
+    """
+    [신규] 원본 시험 데이터의 행별 복합 키(시편배치 앞 8자리, 외경, 두께, Heat No.)를
+    정규화된 값으로 만드는 함수 (키 값이 비어 있는 행은 처리 함수와 같이 제외)
+    """
+    key_source = [find_column(df.columns, keyword) for keyword in BASE_KEY_COLS]
+    if not all(key_source):
+        return pd.DataFrame(columns=RESULT_KEY_COLS)
+    keys = pd.DataFrame({
+        '시편배치': df[key_source[0]].str[:8],
+        '외경': df[key_source[1]],
+        '두께': df[key_source[2]],
+        'Heat No.': df[key_source[3]],
+    }, index=df.index).dropna()
+    return keys.apply(lambda col: col.map(normalize_cell_value)).astype(object)
+
+
+def input_fingerprints(df, keys):
+    """
+    [신규] 키별 원본 행(순서 포함)의 지문을 {키: 정수}로 반환하는 함수
+    키의 처리 결과는 그 키의 원본 행에만 의존하므로, 지문이 같으면 처리 결과도 같음
+    [수정] 행 해시는 row_hashes로 계산 (새 행 때문에 컬럼이 정수에서 실수로 바뀌어도
+    기존 키의 지문은 그대로이므로 전체 이력을 다시 처리하지 않음)
+    """
+    if keys.empty:
+        return {}
+    hashes = row_hashes(df.loc[keys.index])
+    position = keys.groupby(RESULT_KEY_COLS, sort=False).cumcount().to_numpy()
+    combined = pd.util.hash_pandas_object(pd.DataFrame({'row': hashes, 'position': position}), index=False)
+    combined.index = pd.MultiIndex.from_frame(keys)
+    fingerprints = combined.groupby(level=RESULT_KEY_COLS, sort=False).sum()
+    return {key: int(value) for key, value in fingerprints.items()}
+
+
+def key_to_text(key):
+    """[신규] 복합 키 튜플을 키 목록 파일(JSON)에 저장할 문자열로 변환"""
+    return json.dumps(list(key), ensure_ascii=False)
+
+
+def load_key_index(wb):
+    """
+    [수정] 누적 결과 파일(워크북)의 숨김 키 목록 시트를 읽는 함수 (손상된 행은 건너뜀)
+    키 목록은 결과 파일 안에 있으므로 제품(결과 파일)이나 세션마다 섞이지 않음
+    시트가 없으면 이전 버전의 로컬 키 목록 파일을 읽고, 그것도 없으면 빈 목록
+    """
+    sheet_name = INCREMENTAL_CONFIG['index_sheet']
+    if sheet_name not in wb.sheetnames:
+        return load_legacy_key_index(INCREMENTAL_CONFIG['legacy_index_path'])
+    key_index = {}
+    for key_text, entry_text in wb[sheet_name].iter_rows(values_only=True, max_col=2):
+        try:
+            entry = json.loads(entry_text)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(key_text, str) and isinstance(entry, dict):
+            key_index[key_text] = entry
+    return key_index
+
+
+def load_legacy_key_index(path):
+    """[신규] 이전 버전의 로컬 키 목록 파일(JSON)을 읽는 함수 (없거나 손상되었으면 빈 목록)"""
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('keys', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_key_index(wb, key_index):
+    """
+    [수정] 키 목록을 워크북의 숨김 시트에 저장하는 함수 (키 하나당 한 행: 키, 지문 JSON)
+    지문은 엑셀 숫자 정밀도를 넘는 정수라서 JSON 문자열로 저장
+    """
+    sheet_name = INCREMENTAL_CONFIG['index_sheet']
+    if sheet_name in wb.sheetnames:
+        del wb[sheet_name]
+    ws = wb.create_sheet(sheet_name)
+    ws.sheet_state = 'hidden'
+    for key_text, entry in key_index.items():
+        ws.append([key_text, json.dumps(entry)])
+
+
+def read_existing_rows(ws):
+    """
+    [신규] 양식(누적 결과 파일)의 데이터 행을 읽어
+    ({키: 엑셀 행 번호}, {엑셀 행 번호: 행 지문}, {엑셀 행 번호: 행의 키 값})을 반환하는 함수
+    같은 키가 여러 번 있으면 마지막 행을 사용
+    [수정] 행의 키 값은 '시편배치'가 비어 있는 행(성분 데이터가 없는 키)의 위치를 확인할 때 사용
+    """
+    total_cols = len(TEMPLATE_ORDERED_COLS)
+    key_positions = [TEMPLATE_ORDERED_COLS.index(col) for col in RESULT_KEY_COLS]
+    key_rows = {}
+    row_fingerprints = {}
+    row_keys = {}
+    first_row = TEMPLATE_HEADER_ROW + 1
+    for row_num, values in enumerate(ws.iter_rows(min_row=first_row, max_col=total_cols, values_only=True), first_row):
+        values = tuple(values) + (None,) * (total_cols - len(values))
+        row_fingerprints[row_num] = row_fingerprint(values)
+        key = tuple(normalize_cell_value(values[pos]) for pos in key_positions)
+        row_keys[row_num] = key
+        if all(part is not None for part in key):
+            key_rows[key] = row_num
+    return key_rows, row_fingerprints, row_keys
+
+
+def append_incremental(wb, raw_frames, key_index=None):
+    """
+    [신규] 증분 추가 모드로 워크북에 결과를 쓰는 함수
+
+    - raw_frames: {'component': 원본 DataFrame, 'tensile': ..., 'impact': ...}
+    - key_index: 키 목록 ({키 문자열: {'row', 'input', 'output'}})
+      [수정] None이면 워크북의 키 목록 시트(load_key_index)를 사용하고, 갱신된 목록은 워크북에 다시 저장
+    양식에 이미 있고 입력 지문과 행 지문이 키 목록과 같은 키는 처리하지 않으며,
+    새 키는 기존 데이터 다음 행에 추가하고 입력이 바뀐 키는 해당 행을 덮어씀
+    반환: (워크북, 갱신된 키 목록, {'added': 추가 수, 'updated': 덮어쓴 수, 'skipped': 건너뛴 수})
+    """
+    ws = wb.active
+    key_rows, row_fingerprints, row_keys = read_existing_rows(ws)
+    if key_index is None:
+        key_index = load_key_index(wb)
+
+    # 1. 키별 입력 지문 (성분, 인장, 충격 순)
+    frame_keys = {kind: raw_key_frame(df) for kind, df in raw_frames.items()}
+    kind_fingerprints = {kind: input_fingerprints(raw_frames[kind], keys) for kind, keys in frame_keys.items()}
+    all_keys = dict.fromkeys(key for kind in TEST_KINDS if kind in kind_fingerprints for key in kind_fingerprints[kind])
+    fingerprints = {key: [kind_fingerprints.get(kind, {}).get(key, 0) for kind in TEST_KINDS] for key in all_keys}
+
+    # 2. 키 목록에는 있지만 '시편배치'가 비어 있는 행(성분 데이터가 없는 키)은
+    #    [수정] 저장된 행 번호의 행이 '시편배치'만 비어 있고 외경/두께/Heat No.가 같으면 그 행으로 봄
+    #    (행 값이 바뀌었으면 아래에서 출력 지문이 달라 덮어씀)
+    for key_text, entry in key_index.items():
+        key = tuple(json.loads(key_text))
+        if key not in key_rows and row_keys.get(entry.get('row')) == (None,) + key[1:]:
+            key_rows[key] = entry['row']
+
+    changed = []
+    for key, fingerprint in fingerprints.items():
+        entry = key_index.get(key_to_text(key), {})
+        row_num = key_rows.get(key)
+        unchanged = (row_num is not None and entry.get('input') == fingerprint
+                     and entry.get('output') == row_fingerprints.get(row_num))
+        if not unchanged:
+            changed.append(key)
+    stats = {'added': 0, 'updated': 0, 'skipped': len(fingerprints) - len(changed)}
+    # [수정] 이 결과 파일에 있는 키만 남김 (이전 버전의 공용 키 목록 파일에 있던 다른 결과 파일의 키는 버림)
+    key_index = {text: key_index[text] for text in map(key_to_text, key_rows) if text in key_index}
+    if not changed:
+        save_key_index(wb, key_index)
+        return wb, key_index, stats
+
+    # 3. 새 키/바뀐 키의 원본 행만 골라 처리 (규칙 2~4는 키별로 독립적)
+    changed_index = pd.MultiIndex.from_tuples(changed, names=RESULT_KEY_COLS)
+    processed = {}
+    for kind, df in raw_frames.items():
+        keys = frame_keys[kind]
+        selected = keys.index[pd.MultiIndex.from_frame(keys).isin(changed_index)]
+        processed[kind] = process_test_data(kind, df.loc[selected].copy())
+
+    final_df_ordered, all_keys = assemble_final_dataframe(
+        processed['component'], processed['tensile'], processed['impact'], return_keys=True)
+    result_keys = [tuple(normalize_cell_value(part) for part in key) for key in all_keys]
+
+    # 4. 쓸 행 번호: 양식에 있는 키는 그 행, 새 키는 기존 데이터 다음 행부터
+    rows = []
+    next_row = ws.max_row + 1
+    for key in result_keys:
+        if key in key_rows:
+            rows.append(key_rows[key])
+            stats['updated'] += 1
+        else:
+            rows.append(next_row)
+            next_row += 1
+            stats['added'] += 1
+    wb = write_data_to_excel(wb, final_df_ordered, rows=rows)
+    if wb is None:
+        return None, key_index, stats
+
+    # 5. 키 목록 갱신
+    for key, row_num, (_, row_values) in zip(result_keys, rows, iter_row_values(final_df_ordered)):
+        key_index[key_to_text(key)] = {
+            'row': row_num,
+            'input': fingerprints.get(key, [0, 0, 0]),
+            'output': row_fingerprint(list(row_values) + [None] * (len(TEMPLATE_ORDERED_COLS) - len(row_values))),
+        }
+    save_key_index(wb, key_index)
+    return wb, key_index, stats
+
+
+def main_incremental():
+    """[신규] 증분 추가 모드 메인 실행 함수 (INCREMENTAL_CONFIG['enabled'] = True일 때 main()에서 호출)"""
+    print("1/4: 성분, 인장, 충격 데이터 읽는 중...")
+    kinds = TEST_KINDS
+    args_list = [(kind, FILENAME_CONFIG[kind], None, True, False, READ_CONFIG['all_sheets']) for kind in kinds]
+    outputs = run_in_parallel(read_and_process, args_list)
+    raw_frames = {}
+    for kind, (raw_df, _, messages, _) in zip(kinds, outputs):
+        for message in messages:
+            report_error(message)
+        raw_frames[kind] = raw_df
+    if any(df is None for df in raw_frames.values()):
+        print("필수 데이터 파일이 없어 작업을 중단합니다.")
+        return
+
+    # 누적 결과 파일(양식)은 실행마다 바뀌므로 양식 캐시를 거치지 않고 바로 읽음
+    try:
+        wb = openpyxl.load_workbook(FILENAME_CONFIG['template'])
+    except FileNotFoundError:
+        print(f"오류: 템플릿 파일 '{FILENAME_CONFIG['template']}'을 찾을 수 없습니다.")
+        return
+    except Exception as e:
+        print(f"템플릿 파일 로드 중 오류: {e}")
+        return
+
+    print("2/4: 새로 추가되거나 바뀐 키만 처리 중...")
+    wb, _, stats = append_incremental(wb, raw_frames)
+    if wb is None:
+        print("엑셀 파일 쓰기에 실패했습니다.")
+        return
+    print(f"3/4: 추가 {stats['added']}건, 갱신 {stats['updated']}건, 변경 없음 {stats['skipped']}건")
+
+    print(f"4/4: '{FILENAME_CONFIG['output']}' 파일 저장 중...")
+    try:
+        wb.save(FILENAME_CONFIG['output'])
+        print(f"--- 작업 완료! 결과가 '{FILENAME_CONFIG['output']}' 파일에 저장되었습니다. ---")
+    except PermissionError:
+        print(f"오류: '{FILENAME_CONFIG['output']}' 파일이 다른 프로그램에서 열려있어 저장할 수 없습니다. 파일을 닫고 다시 시도해주세요.")
+    except Exception as e:
+        print(f"파일 저장 중 오류가 발생했습니다: {e}")
+
+
+# --- [신규] 대용량(메모리 초과) 분할 처리 모드 ---
+
+# 분할 파일의 행마다 붙이는 파일(시트) 순번 컬럼 (앞의 파일에 이미 있는 행을 버릴 때 사용)
+SOURCE_ORDER_COL = '_원본_순번'
+# 처리 결과의 복합 키 인덱스 이름
+PROCESSED_KEY_NAMES = ['시편배치_키', '외경', '두께', 'Heat No.']
+
+
+def iter_test_data_chunks(kind, source, sheet_name=0, chunk_rows=None):
+    """[신규] read_test_data와 같은 컬럼을 chunk_rows 행씩 DataFrame 조각으로 읽는 함수"""
+    chunk_rows = chunk_rows or OUT_OF_CORE_CONFIG['chunk_rows']
+    if kind == 'impact':
+        for df in iter_excel_column_chunks(source, select_impact_columns, header_rows=2,
+                                           sheet_name=sheet_name, chunk_rows=chunk_rows):
+            df.columns = flatten_impact_columns(df.columns)
+            yield df
+        return
+    if kind == 'component':
+        wanted = set(COMPONENT_READ_COLS)
+    elif kind == 'tensile':
+        wanted = set(TENSILE_READ_COLS)
+    else:
+        raise ValueError(f"알 수 없는 시험 종류입니다: {kind}")
+    yield from iter_excel_column_chunks(source, lambda cols: [i for i, col in enumerate(cols) if col in wanted],
+                                        sheet_name=sheet_name, chunk_rows=chunk_rows)
+
+
+def raw_key_columns(kind, columns):
+    """[신규] 원본에서 복합 키(시편배치, 외경, 두께, Heat No.) 컬럼명을 찾는 함수 (필수 컬럼이 없으면 None)"""
+    if kind == 'impact':
+        found = [find_column(columns, keyword) for keyword in IMPACT_KEY_KEYWORDS]
+        return found[:len(BASE_KEY_COLS)] if all(found) else None
+    return BASE_KEY_COLS if all(col in columns for col in BASE_KEY_COLS) else None
+
+
+def partition_numbers(df, key_cols, partitions):
+    """
+    [신규] 복합 키 해시로 행마다 분할 번호(0 ~ partitions-1)를 정하는 함수
+
+    '시편배치'는 처리 규칙과 같이 앞 8자리만 사용하고, 숫자 값은 실수로 맞춰
+    조각마다 타입 추론이 달라도(예: 508과 508.0) 같은 키는 같은 분할로 보냄
+    """
+    normalized = {}
+    for i, col in enumerate(key_cols):
+        values = df[col]
+        if i == 0:
+            normalized[i] = values.astype(str).str[:8]
+            continue
+        numbers = pd.to_numeric(values, errors='coerce')
+        normalized[i] = numbers.astype(float).astype(str).where(numbers.notna(), values.astype(str))
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False).to_numpy()
+    return (hashes % partitions).astype(np.intp)
+
+
+def spill_path(spill_dir, kind, partition):
+    """[신규] 시험 종류와 분할 번호로 분할 임시 파일 경로를 만드는 함수"""
+    return os.path.join(spill_dir, f"{kind}-{partition}.pkl")
+
+
+def spill_test_sources(kind, sources, spill_dir, partitions, all_sheets=False):
+    """
+    [신규] 한 시험 종류의 파일(시트)을 조각씩 읽어 복합 키 해시로 나누고, 분할별 임시 파일에 이어 쓰는 함수
+
+    - sources: 파일 경로/파일 객체/bytes 하나 또는 목록 (read_test_sources와 같음)
+    - 분할 파일에는 파일(시트) 순번 컬럼을 붙인 DataFrame 조각을 pickle로 차례로 기록
+    반환: 기록한 행 수 (읽지 못하거나 필수 키 컬럼이 없으면 None)
+    """
+    files = {}
+    total_rows = 0
+    try:
+        for order, (source, sheet_name, _) in enumerate(iter_source_sheets(sources, all_sheets)):
+            try:
+                for chunk in iter_test_data_chunks(kind, source, sheet_name):
+                    key_cols = raw_key_columns(kind, chunk.columns)
+                    if key_cols is None:
+                        report_error(f"{kind} 시험 파일에 필수 키 컬럼이 없습니다. (컬럼: {list(chunk.columns)})")
+                        return None
+                    numbers = partition_numbers(chunk, key_cols, partitions)
+                    chunk[SOURCE_ORDER_COL] = np.int32(order)
+                    for partition in np.unique(numbers):
+                        if partition not in files:
+                            files[partition] = open(spill_path(spill_dir, kind, partition), 'wb')
+                        pickle.dump(chunk[numbers == partition], files[partition], protocol=pickle.HIGHEST_PROTOCOL)
+                    total_rows += len(chunk)
+            except FileNotFoundError:
+                report_error(f"오류: '{source}' 파일을 찾을 수 없습니다. 스크립트와 같은 폴더에 파일이 있는지 확인하세요.")
+                return None
+            except Exception as e:
+                report_error(f"오류: '{source}' 파일을 읽는 중 문제가 발생했습니다: {e}")
+                return None
+    finally:
+        for f in files.values():
+            f.close()
+    return total_rows
+
+
+def load_spilled_partition(kind, spill_dir, partition):
+    """
+    [신규] 분할 파일의 조각을 모두 읽어 원본 DataFrame으로 합치는 함수 (분할 파일이 없으면 None)
+    read_test_sources와 같이 앞의 파일(시트)에 이미 있는 행은 버리고, 같은 파일(시트) 안의 같은 행은 그대로 둠
+    """
+    path = spill_path(spill_dir, kind, partition)
+    if not os.path.exists(path):
+        return None
+    frames = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                frames.append(pickle.load(f))
+            except EOFError:
+                break
+    df = pd.concat(frames, ignore_index=True)
+    order = df.pop(SOURCE_ORDER_COL).to_numpy()
+    if order.max() > 0:
+        # 같은 값의 행은 키도 같으므로 같은 분할에 있음
+        df = drop_repeated_rows(df, order)
+    return compact_raw_frame(kind, df)
+
+
+def empty_processed_frame():
+    """[신규] 행이 없는 처리 결과 (분할에 해당 시험 종류의 행이 없을 때 사용)"""
+    return pd.DataFrame(index=pd.MultiIndex.from_arrays([[]] * len(PROCESSED_KEY_NAMES), names=PROCESSED_KEY_NAMES))
+
+
+def iter_partition_results(spill_dir, partitions):
+    """[신규] 분할마다 성분/인장/충격 원본을 읽어 규칙 2~4로 처리하고 템플릿 순서의 DataFrame을 돌려주는 함수"""
+    for partition in range(partitions):
+        processed = []
+        for kind in TEST_KINDS:
+            raw_df = load_spilled_partition(kind, spill_dir, partition)
+            processed.append(empty_processed_frame() if raw_df is None else process_test_data(kind, raw_df))
+        final_df_ordered = assemble_final_dataframe(*processed)
+        if len(final_df_ordered):
+            yield final_df_ordered
+
+
+def consolidate_out_of_core(sources, template_file, output, all_sheets=False, profile=None):
+    """
+    [신규] 대용량(메모리 초과) 분할 처리 모드로 통합 결과 파일을 만드는 함수
+
+    1. 성분/인장/충격 파일을 조각씩 읽어 복합 키 해시로 나눈 분할 임시 파일에 옮김
+    2. 분할마다 원본을 읽어 같은 규칙(2~4)으로 처리하고 병합한 뒤, 스트리밍 쓰기로 결과 파일에 바로 기록
+    같은 키의 행은 항상 같은 분할에 있으므로 결과 값은 일반 모드와 같고, 메모리에는 분할 하나만 올라감
+    (결과 행은 분할 순서로 기록되며, 복합 키 순서 정렬은 분할 안에서만 적용됨)
+
+    - sources: {시험 종류: 파일 경로/파일 객체/bytes 또는 그 목록}
+    - output: 저장할 경로 또는 파일 객체 (None이면 임시 파일)
+    반환: (저장 경로 또는 파일 객체, 결과 행 수), 실패하면 (None, 0)
+    """
+    profile = profile or PipelineProfile()
+    partitions = OUT_OF_CORE_CONFIG['partitions']
+    with tempfile.TemporaryDirectory(prefix='seah_out_of_core_', dir=OUT_OF_CORE_CONFIG['spill_dir']) as spill_dir:
+        with profile.stage('partition') as record:
+            spilled_rows = 0
+            for kind in TEST_KINDS:
+                rows = spill_test_sources(kind, sources[kind], spill_dir, partitions, all_sheets)
+                if rows is None:
+                    return None, 0
+                spilled_rows += rows
+            record['rows_out'] = spilled_rows
+
+        with profile.stage('process_write', rows_in=spilled_rows) as record:
+            record['rows_out'] = 0
+
+            def counted(frames):
+                for frame in frames:
+                    record['rows_out'] += len(frame)
+                    yield frame
+
+            output = write_data_to_excel_streaming(template_file, counted(iter_partition_results(spill_dir, partitions)),
+                                                   output)
+        return output, record['rows_out']
+
+
+def main_out_of_core():
+    """[신규] 분할 처리 모드 메인 실행 함수 (OUT_OF_CORE_CONFIG['enabled'] = True일 때 main()에서 호출)"""
+    print(f"1/2: 성분, 인장, 충격 데이터를 {OUT_OF_CORE_CONFIG['partitions']}개 분할로 나누는 중...")
+    profile = PipelineProfile()
+    try:
+        # 분할별 처리 결과를 결과 파일에 바로 기록 (2/2 단계 포함)
+        output, rows = consolidate_out_of_core({kind: FILENAME_CONFIG[kind] for kind in TEST_KINDS},
+                                               FILENAME_CONFIG['template'], FILENAME_CONFIG['output'],
+                                               all_sheets=READ_CONFIG['all_sheets'], profile=profile)
+        if output is None:
+            print("분할 처리에 실패했습니다.")
+            return
+        print(f"2/2: 결과 {rows}행을 '{FILENAME_CONFIG['output']}' 파일에 저장했습니다.")
+        print(f"--- 작업 완료! 결과가 '{FILENAME_CONFIG['output']}' 파일에 저장되었습니다. ---")
+        print_profile(profile)
+    except PermissionError:
+        print(f"오류: '{FILENAME_CONFIG['output']}' 파일이 다른 프로그램에서 열려있어 저장할 수 없습니다. 파일을 닫고 다시 시도해주세요.")
+    except Exception as e:
+        print(f"파일 저장 중 오류가 발생했습니다: {e}")
+
+
+def print_profile(profile):
+    """[신규] 단계별 계측 결과를 출력하고, PROFILE_CONFIG['json_path']가 있으면 JSON으로 저장하는 함수"""
+    print("--- 단계별 소요 시간 ---")
+    print(profile.format_table())
+    profile.export_json(output=FILENAME_CONFIG['output'])
+
+
+def main():
+    """메인 실행 함수 (로컬 실행용)"""
+    print("--- 데이터 통합 작업을 시작합니다 ---")
+
+    # [신규] 증분 추가 모드: 새로 생기거나 바뀐 키만 처리하여 양식에 추가
+    if INCREMENTAL_CONFIG['enabled']:
+        main_incremental()
+        return
+
+    # [신규] 분할 처리 모드: 입력이 메모리보다 클 때 키 해시 분할 단위로 처리하여 결과 파일에 바로 기록
+    if OUT_OF_CORE_CONFIG['enabled']:
+        main_out_of_core()
+        return
+
+    # [신규] 단계별 소요 시간/행 수/메모리 계측
+    profile = PipelineProfile()
+
+    # [수정] 성분, 인장, 충격 파일 읽기와 처리를 동시에 실행 (PARALLEL_CONFIG)
+    print("1/4: 성분, 인장, 충격 데이터 읽기 및 처리 중...")
+    processed = read_and_process_all({kind: FILENAME_CONFIG[kind] for kind in TEST_KINDS}, profile=profile,
+                                     all_sheets=READ_CONFIG['all_sheets'])
+
+    if any(df is None for df in processed.values()):
+        print("필수 데이터 파일이 없어 작업을 중단합니다.")
+        return
+
+    processed_comp = processed['component']
+    processed_tens = processed['tensile']
+    processed_impa = processed['impact']
+
+    print("2/4: 처리된 데이터 병합 중...")
+    rows_in = len(processed_comp) + len(processed_tens) + len(processed_impa)
+    # [수정] 복합 키 합집합 기준으로 한 번에 맞춰 템플릿 순서의 DataFrame을 바로 생성
+    with profile.stage('assemble', rows_in=rows_in) as record:
+        final_df_ordered = assemble_final_dataframe(processed_comp, processed_tens, processed_impa)
+        record['rows_out'] = len(final_df_ordered)
+
+    print("3/4: 엑셀 템플릿 파일에 데이터 쓰는 중...")
+
+    if STREAMING_OUTPUT:
+        # [신규] 스트리밍 모드: 양식 헤더를 옮기고 데이터 행을 결과 파일에 바로 기록
+        print(f"4/4: '{FILENAME_CONFIG['output']}' 파일에 스트리밍 저장 중...")
+        try:
+            with profile.stage('write_save', rows_in=len(final_df_ordered)) as record:
+                output = write_data_to_excel_streaming(FILENAME_CONFIG['template'], final_df_ordered, FILENAME_CONFIG['output'])
+                record['rows_out'] = len(final_df_ordered)
+            if output is None:
+                return
+            print(f"--- 작업 완료! 결과가 '{FILENAME_CONFIG['output']}' 파일에 저장되었습니다. ---")
+            print_profile(profile)
+        except PermissionError:
+            print(f"오류: '{FILENAME_CONFIG['output']}' 파일이 다른 프로그램에서 열려있어 저장할 수 없습니다. 파일을 닫고 다시 시도해주세요.")
+        except Exception as e:
+            print(f"파일 저장 중 오류가 발생했습니다: {e}")
+        return
+
+    # [수정] 양식은 캐시된 복제본 사용 (get_template 참고)
+    try:
+        wb = load_template_workbook(FILENAME_CONFIG['template'])
+    except FileNotFoundError:
+        print(f"오류: 템플릿 파일 '{FILENAME_CONFIG['template']}'을 찾을 수 없습니다.")
+        return
+    except Exception as e:
+        print(f"템플릿 파일 로드 중 오류: {e}")
+        return
+
+    # [신규] 엑셀 쓰기 함수 호출
+    with profile.stage('write', rows_in=len(final_df_ordered)) as record:
+        wb = write_data_to_excel(wb, final_df_ordered)
+        record['rows_out'] = len(final_df_ordered)
+
+    if wb is None:
+        print("엑셀 파일 쓰기에 실패했습니다.")
+        return
+
+    print(f"4/4: '{FILENAME_CONFIG['output']}' 파일 저장 중...")
+    try:
+        with profile.stage('save'):
+            wb.save(FILENAME_CONFIG['output'])
+        print(f"--- 작업 완료! 결과가 '{FILENAME_CONFIG['output']}' 파일에 저장되었습니다. ---")
+        print_profile(profile)
+    except PermissionError:
+        print(f"오류: '{FILENAME_CONFIG['output']}' 파일이 다른 프로그램에서 열려있어 저장할 수 없습니다. 파일을 닫고 다시 시도해주세요.")
+    except Exception as e:
+        print(f"파일 저장 중 오류가 발생했습니다: {e}")
+
+
+# [신규] 로컬 실행을 위한 엔트리 포인트 (Streamlit 없이 실행)
+if __name__ == "__main__":
+    main()
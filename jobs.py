@@ -0,0 +1,279 @@
+"""
+[신규] Streamlit 화면을 멈추지 않고 통합 작업을 실행하는 백그라운드 작업 실행기
+
+'결과 생성' 버튼은 작업을 대기열에 넣기만 하고 바로 끝나며, 작업은 서버 프로세스가 공유하는
+작업 스레드(최대 JOB_CONFIG['max_workers']개)에서 순서대로 실행됩니다.
+- 작업마다 현재 단계, 처리 행 수, 단계별 기록(PipelineProfile)을 화면에서 읽을 수 있음
+- 취소하면 대기 중인 작업은 바로, 실행 중인 작업은 다음 단계가 시작되기 전에 중단
+- 끝난 작업의 결과는 작업 ID로 찾을 수 있으며, 최근 JOB_CONFIG['keep_finished']개까지 보관
+"""
+import io
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import openpyxl
+
+from data_cache import file_digest, get_cache, output_key, read_all_cached, read_and_process_all_cached
+from data_processing import (
+    TEST_KINDS, PipelineProfile, append_incremental, assemble_final_dataframe, collect_errors,
+    load_template_workbook, write_data_to_excel, write_data_to_excel_streaming,
+)
+
+# --- 설정 부분 ---
+JOB_CONFIG = {
+    # 동시에 실행할 작업 수 (나머지는 대기열에서 기다림)
+    "max_workers": 2,
+    # 대기열에 쌓을 수 있는 최대 작업 수 (넘으면 새 작업을 받지 않음)
+    "max_queued": 20,
+    # 결과를 보관할 끝난 작업 수 (오래된 작업부터 삭제, 스트리밍 결과 임시 파일도 삭제)
+    "keep_finished": 50,
+    # 화면에서 진행 상황을 다시 읽는 간격 (초)
+    "poll_seconds": 1.0,
+}
+
+# 작업 상태
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+STATUS_LABELS = {QUEUED: '대기 중', RUNNING: '실행 중', DONE: '완료', FAILED: '실패', CANCELLED: '취소됨'}
+
+
+class JobCancelled(Exception):
+    """작업이 취소되어 다음 단계를 실행하지 않을 때 발생하는 예외"""
+
+
+class Job:
+    """
+    작업 하나의 상태와 결과
+
+    - profile: 작업 함수가 단계를 기록하는 PipelineProfile (단계가 시작될 때 취소 여부 확인)
+    - expected_stages: 예상 단계 수 (작업 함수가 지정, 진행률 계산용)
+    - result: 작업 함수의 반환값 (완료된 경우), errors: 오류 메시지 목록
+    """
+
+    def __init__(self, label=''):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.status = QUEUED
+        self.created = time.time()
+        self.finished = None
+        self.current_stage = None
+        self.current_rows = None
+        self.expected_stages = None
+        self.result = None
+        self.errors = []
+        self.profile = PipelineProfile(listener=self._on_stage)
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    def _on_stage(self, event, record):
+        if event == 'start':
+            if self._cancel_event.is_set():
+                raise JobCancelled()
+            self.current_stage = record['stage']
+            self.current_rows = record['rows_in']
+        else:
+            self.current_rows = record['rows_out'] if record['rows_out'] is not None else self.current_rows
+
+    def is_active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def cancel(self):
+        """작업 취소 요청 (대기 중이면 바로 취소, 실행 중이면 다음 단계 시작 전에 중단)"""
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self._finish(CANCELLED)
+
+    def progress(self):
+        """(진행률 0~1, 진행 상황 문장)을 반환하는 함수"""
+        done = len(self.profile.records)
+        if self.status == DONE:
+            return 1.0, f"완료 ({done}단계)"
+        fraction = min(done / self.expected_stages, 0.99) if self.expected_stages else 0.0
+        if self.status != RUNNING:
+            return fraction, STATUS_LABELS[self.status]
+        text = f"{self.current_stage or '준비'} 진행 중"
+        if self.current_rows is not None:
+            text += f" ({self.current_rows:,}행)"
+        return fraction, text
+
+    def _finish(self, status):
+        self.status = status
+        self.finished = time.time()
+        self.current_stage = None
+
+
+class JobRunner:
+    """정해진 수의 작업 스레드와 대기열로 작업을 실행하고, 작업 ID로 상태/결과를 찾는 클래스"""
+
+    def __init__(self, max_workers, max_queued, keep_finished):
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='consolidation-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, label=''):
+        """
+        func(job, *args)를 대기열에 넣고 작업 객체를 반환하는 함수
+        대기 중인 작업이 max_queued개 이상이면 RuntimeError
+        """
+        with self._lock:
+            queued = sum(job.status == QUEUED for job in self._jobs.values())
+            if queued >= self.max_queued:
+                raise RuntimeError(f"대기 중인 작업이 너무 많습니다 ({queued}개). 잠시 후 다시 시도해주세요.")
+            job = Job(label)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, func, args)
+            self._evict()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, func, args):
+        if job._cancel_event.is_set():
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        # 작업 중 오류 메시지는 화면(st.error)에 직접 쓰지 않고 작업에 모아 둠
+        with collect_errors() as messages:
+            try:
+                job.result = func(job, *args)
+                status = DONE
+            except JobCancelled:
+                status = CANCELLED
+            except Exception as e:
+                messages.append(str(e))
+                status = FAILED
+        job.errors = list(messages)
+        job._finish(status)
+
+    def _evict(self):
+        finished = sorted((job for job in self._jobs.values() if not job.is_active()), key=lambda job: job.finished)
+        for job in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job.id]
+            output_path = (job.result or {}).get('output_path')
+            if output_path and os.path.exists(output_path):
+                os.remove(output_path)
+
+
+# 서버 프로세스 전체에서 공유하는 작업 실행기
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """공유 작업 실행기를 반환하는 함수 (처음 호출할 때 JOB_CONFIG로 생성)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner(JOB_CONFIG['max_workers'], JOB_CONFIG['max_queued'], JOB_CONFIG['keep_finished'])
+        return _runner
+
+
+def consolidate_uploads(job, file_bytes, template_name, streaming=False, incremental=False, all_sheets=False):
+    """
+    업로드한 파일 내용으로 통합 결과 파일을 만드는 작업 함수 (app.py의 '결과 생성' 버튼)
+
+    - file_bytes: {'template': bytes, 'component': [bytes, ...], 'tensile': [...], 'impact': [...]}
+    - streaming: 결과를 임시 파일에 스트리밍으로 기록, incremental: 증분 추가 모드
+    - all_sheets: 시험 결과 파일의 모든 시트를 읽음
+    반환: {'output': 결과 파일 bytes 또는 None, 'output_path': 스트리밍 결과 임시 파일 경로 또는 None,
+           'info': 화면에 보여줄 안내 문장 또는 None}
+    실패하면 ValueError (메시지는 작업의 오류 목록에 남음)
+    """
+    profile = job.profile
+    result = {'output': None, 'output_path': None, 'info': None}
+
+    # 업로드 파일 내용의 해시 (같은 파일이면 이전에 읽고 처리한 결과를 재사용)
+    digests = {kind: file_digest(data) for kind, data in file_bytes.items()}
+    final_output_key = output_key(digests['template'], digests['component'], digests['tensile'], digests['impact'],
+                                  all_sheets)
+    test_bytes = {kind: file_bytes[kind] for kind in TEST_KINDS}
+    test_digests = {kind: digests[kind] for kind in TEST_KINDS}
+
+    # 4개 파일이 모두 이전과 같으면 저장해 둔 결과 파일을 그대로 사용
+    # (스트리밍 모드는 결과를 메모리에 두지 않기 위해 결과 파일 캐시를 사용하지 않음)
+    cached_output = None if streaming or incremental else get_cache().get(final_output_key)
+    if cached_output is not None:
+        job.expected_stages = 1
+        profile.extend([PipelineProfile.skipped_record('output', '캐시')])
+        result['output'] = cached_output
+    elif incremental:
+        # 증분 추가 모드: 원본만 읽고, 키 목록과 비교해 바뀐 키만 처리
+        job.expected_stages = 3
+        with profile.stage('read') as record:
+            raw_frames = read_all_cached(test_bytes, test_digests, all_sheets=all_sheets)
+            record['rows_out'] = sum(len(df) for df in raw_frames.values() if df is not None)
+        if any(df is None for df in raw_frames.values()):
+            raise ValueError("시험 결과 파일을 읽지 못했습니다.")
+        wb = load_template(file_bytes['template'], cached=False)
+
+        # 키 목록은 결과 파일의 숨김 시트에서 읽고 다시 저장 (작업마다 자기 결과 파일만 사용)
+        with profile.stage('incremental', rows_in=record['rows_out']) as record:
+            wb, _, stats = append_incremental(wb, raw_frames)
+            record['rows_out'] = stats['added'] + stats['updated']
+        if wb is None:
+            raise ValueError("엑셀 파일 쓰기에 실패했습니다.")
+
+        output_buffer = io.BytesIO()
+        with profile.stage('save'):
+            wb.save(output_buffer)
+        result['output'] = output_buffer.getvalue()
+        result['info'] = f"추가 {stats['added']}건, 갱신 {stats['updated']}건, 변경 없음 {stats['skipped']}건"
+    else:
+        # 읽기+처리 6단계, 병합, 쓰기(+저장)
+        job.expected_stages = 8 if streaming else 9
+        # 1-2. 파일 읽기 및 데이터 처리 (같은 내용의 파일은 캐시된 결과 사용)
+        processed = read_and_process_all_cached(test_bytes, test_digests, profile=profile, all_sheets=all_sheets)
+        if any(df is None or df.empty for df in processed.values()):
+            raise ValueError("데이터 처리 중 오류가 발생했습니다. 각 파일에 필요한 키 컬럼이 모두 있는지 확인해주세요.")
+
+        # 3. 데이터 병합 (템플릿 순서의 DataFrame을 바로 생성)
+        with profile.stage('assemble', rows_in=sum(len(df) for df in processed.values())) as record:
+            final_df_ordered = assemble_final_dataframe(processed['component'], processed['tensile'], processed['impact'])
+            record['rows_out'] = len(final_df_ordered)
+
+        if streaming:
+            # 4-5. 양식 헤더를 옮긴 뒤 데이터 행을 임시 파일에 바로 기록
+            with profile.stage('write_save', rows_in=len(final_df_ordered)) as record:
+                output_path = write_data_to_excel_streaming(file_bytes['template'], final_df_ordered)
+                record['rows_out'] = len(final_df_ordered)
+            if output_path is None:
+                raise ValueError("엑셀 파일 쓰기에 실패했습니다.")
+            result['output_path'] = output_path
+        else:
+            # 4. 템플릿에 데이터 쓰기
+            wb = load_template(file_bytes['template'])
+            with profile.stage('write', rows_in=len(final_df_ordered)) as record:
+                wb = write_data_to_excel(wb, final_df_ordered)
+                record['rows_out'] = len(final_df_ordered)
+            if wb is None:
+                raise ValueError("엑셀 파일 쓰기에 실패했습니다.")
+
+            # 5. 최종 엑셀 파일을 메모리에 저장
+            output_buffer = io.BytesIO()
+            with profile.stage('save'):
+                wb.save(output_buffer)
+            result['output'] = output_buffer.getvalue()
+            get_cache().put(final_output_key, result['output'])
+
+    profile.export_json(template=template_name)
+    return result
+
+
+def load_template(template_bytes, cached=True):
+    """
+    양식 파일 내용(bytes)으로 워크북을 여는 함수 (실패하면 ValueError)
+    cached=True이면 내용 해시로 캐시된 양식의 복제본을 사용 (증분 추가 모드의 누적 결과 파일처럼
+    실행마다 바뀌는 양식은 cached=False)
+    """
+    try:
+        if cached:
+            return load_template_workbook(template_bytes)
+        return openpyxl.load_workbook(io.BytesIO(template_bytes))
+    except Exception as e:
+        raise ValueError(f"템플릿 파일을 여는 중 오류가 발생했습니다: {e}")
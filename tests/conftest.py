@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import columnar_store  # noqa: E402
+import generate_data  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def data_dir(tmp_path_factory):
+    """벤치마크 생성기로 만든 작은 시험 결과 파일 폴더 (양식 포함)"""
+    return generate_data.generate(300, str(tmp_path_factory.mktemp('data')))
+
+
+@pytest.fixture(autouse=True)
+def no_columnar_store(monkeypatch):
+    """
+    열 기반 중간 저장소를 끄고 엑셀을 직접 읽음 (사용자 저장소 폴더에 파일을 남기지 않음)
+    저장소를 시험하는 테스트는 임시 폴더로 바꾼 뒤 다시 켬
+    """
+    monkeypatch.setitem(columnar_store.COLUMNAR_CONFIG, 'enabled', False)
@@ -0,0 +1,79 @@
+"""열 기반 중간 저장소: 크기/기간 제한을 넘는 오래된 파일 삭제"""
+import os
+import shutil
+import time
+
+import pandas as pd
+import pytest
+
+import columnar_store
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setitem(columnar_store.COLUMNAR_CONFIG, 'enabled', True)
+    monkeypatch.setitem(columnar_store.COLUMNAR_CONFIG, 'store_dir', str(tmp_path / 'columnar'))
+    monkeypatch.setitem(columnar_store.COLUMNAR_CONFIG, 'max_bytes', None)
+    monkeypatch.setitem(columnar_store.COLUMNAR_CONFIG, 'max_age_days', None)
+    return columnar_store.COLUMNAR_CONFIG
+
+
+def save_frame(digest, age_days=0):
+    df = pd.DataFrame({'시편배치': [f'{digest}A00'] * 100, 'C': [0.05] * 100})
+    assert columnar_store.save('component', digest, df)
+    path = columnar_store.store_path('component', digest)
+    mtime = time.time() - age_days * 24 * 60 * 60
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_files_unused_longer_than_max_age_are_removed(store):
+    old = save_frame('old', age_days=30)
+    recent = save_frame('recent', age_days=1)
+    store['max_age_days'] = 7
+
+    assert columnar_store.prune() == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
+
+
+def test_oldest_files_are_removed_over_max_bytes(store):
+    paths = [save_frame(digest, age_days=age) for digest, age in [('a', 3), ('b', 2), ('c', 1)]]
+    store['max_bytes'] = os.path.getsize(paths[0]) * 2
+
+    assert columnar_store.prune() == 1
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
+
+
+def test_load_keeps_file_from_expiring(store):
+    path = save_frame('used', age_days=30)
+    assert columnar_store.load('component', 'used') is not None
+    store['max_age_days'] = 7
+
+    assert columnar_store.prune() == 0
+    assert os.path.exists(path)
+
+
+def test_saving_new_format_version_replaces_older_versions(store):
+    df = pd.DataFrame({'시편배치': ['10000001A00'] * 600, 'C': [0.05] * 600})
+    assert columnar_store.save('component', 'export', df, version='v1')
+    assert columnar_store.save('component', 'export', df, version='v1-s1')
+    assert columnar_store.save('component', 'export', df, version='v2')
+
+    names = sorted(os.listdir(os.path.join(store['store_dir'], 'component')))
+    assert names == ['export-v1-s1.arrow', 'export-v2.arrow']
+
+
+def test_load_all_counts_each_export_once(store):
+    # 읽기 형식 버전이 바뀌기 전에 저장된 파일과 새 버전 파일이 같이 남아 있는 저장소
+    df = pd.DataFrame({'시편배치': ['10000001A00'] * 600, 'C': [0.05] * 600})
+    assert columnar_store.save('component', 'export', df, version='v1')
+    old = columnar_store.store_path('component', 'export', 'v1')
+    shutil.copyfile(old, columnar_store.store_path('component', 'export', 'v2'))
+    os.utime(old, (time.time() - 60, time.time() - 60))
+
+    combined = columnar_store.load_all('component')
+    assert len(combined) == 600
+    assert set(combined['원본_해시']) == {'export'}
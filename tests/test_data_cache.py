@@ -0,0 +1,66 @@
+"""디스크 캐시 폴더: 이 사용자만 접근할 수 있는 폴더에만 pickle 파일을 저장"""
+import os
+import stat
+import sys
+
+import pandas as pd
+import pytest
+
+import data_cache
+
+posix_only = pytest.mark.skipif(sys.platform == 'win32', reason='POSIX 권한 확인')
+
+
+@posix_only
+def test_cache_dir_is_created_private(tmp_path):
+    cache = data_cache.ContentCache(1024 * 1024, str(tmp_path / 'cache'), 1024 * 1024)
+    assert stat.S_IMODE(os.stat(cache.disk_dir).st_mode) == 0o700
+
+    cache.put('key', {'value': 1})
+    assert data_cache.ContentCache(1024 * 1024, cache.disk_dir, 1024 * 1024).get('key') == {'value': 1}
+
+
+@posix_only
+def test_existing_open_cache_dir_is_made_private(tmp_path):
+    disk_dir = tmp_path / 'cache'
+    disk_dir.mkdir()
+    disk_dir.chmod(0o777)
+    cache = data_cache.ContentCache(1024 * 1024, str(disk_dir), 1024 * 1024)
+    assert cache.disk_dir == str(disk_dir)
+    assert stat.S_IMODE(os.stat(disk_dir).st_mode) == 0o700
+
+
+@posix_only
+def test_symlinked_cache_dir_disables_disk_cache(tmp_path):
+    target = tmp_path / 'elsewhere'
+    target.mkdir()
+    link = tmp_path / 'cache'
+    link.symlink_to(target)
+    cache = data_cache.ContentCache(1024 * 1024, str(link), 1024 * 1024)
+    assert cache.disk_dir is None
+
+    cache.put('key', 'value')
+    assert os.listdir(target) == []
+
+
+@posix_only
+@pytest.mark.skipif(not hasattr(os, 'geteuid') or os.geteuid() != 0, reason='다른 사용자 소유 폴더를 만들려면 root 필요')
+def test_cache_dir_owned_by_other_user_disables_disk_cache(tmp_path):
+    disk_dir = tmp_path / 'cache'
+    disk_dir.mkdir(mode=0o700)
+    os.chown(disk_dir, 65534, 65534)
+    cache = data_cache.ContentCache(1024 * 1024, str(disk_dir), 1024 * 1024)
+    assert cache.disk_dir is None
+
+
+def test_memory_only_put_does_not_pickle_frames(tmp_path, monkeypatch):
+    cache = data_cache.ContentCache(64 * 1024 * 1024, str(tmp_path / 'cache'), 64 * 1024 * 1024)
+    df = pd.DataFrame({'시편배치': ['10000001A00'] * 1000, 'C': [0.05] * 1000})
+
+    def fail(*args, **kwargs):
+        raise AssertionError('pickle.dumps called')
+    monkeypatch.setattr(data_cache.pickle, 'dumps', fail)
+    cache.put('raw', df, disk=False)
+
+    assert cache.get('raw').equals(df)
+    assert os.listdir(cache.disk_dir) == []
@@ -0,0 +1,67 @@
+"""증분 추가 모드: 같은 입력으로 다시 실행하면 추가/갱신되는 행이 없어야 함"""
+import os
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import data_processing as dp
+
+
+@pytest.fixture(autouse=True)
+def no_legacy_index(monkeypatch):
+    monkeypatch.setitem(dp.INCREMENTAL_CONFIG, 'legacy_index_path', None)
+
+
+def run_incremental(data_dir, template_path, output_path):
+    raw_frames = {kind: dp.read_test_data(kind, os.path.join(data_dir, dp.FILENAME_CONFIG[kind]))
+                  for kind in dp.TEST_KINDS}
+    wb = openpyxl.load_workbook(template_path)
+    wb, _, stats = dp.append_incremental(wb, raw_frames)
+    wb.save(output_path)
+    return stats
+
+
+def test_rerun_on_same_inputs_adds_and_updates_nothing(data_dir, tmp_path):
+    template = os.path.join(data_dir, dp.FILENAME_CONFIG['template'])
+    first = run_incremental(data_dir, template, str(tmp_path / 'run1.xlsx'))
+    assert first['added'] > 0 and first['updated'] == 0
+
+    # 이전 결과 파일을 양식으로 두 번 다시 실행
+    for run in (2, 3):
+        previous = str(tmp_path / f'run{run - 1}.xlsx')
+        stats = run_incremental(data_dir, previous, str(tmp_path / f'run{run}.xlsx'))
+        assert (stats['added'], stats['updated']) == (0, 0)
+        assert stats['skipped'] == first['added']
+
+    rows = openpyxl.load_workbook(tmp_path / 'run3.xlsx').active.max_row
+    assert rows == openpyxl.load_workbook(tmp_path / 'run1.xlsx').active.max_row
+
+
+def test_key_index_is_kept_in_each_workbook(data_dir, tmp_path):
+    template = os.path.join(data_dir, dp.FILENAME_CONFIG['template'])
+    run_incremental(data_dir, template, str(tmp_path / 'product_a.xlsx'))
+
+    # 다른 결과 파일(빈 양식)은 앞의 실행과 키 목록을 공유하지 않음
+    other = run_incremental(data_dir, template, str(tmp_path / 'product_b.xlsx'))
+    assert other['added'] > 0
+
+    wb = openpyxl.load_workbook(tmp_path / 'product_a.xlsx')
+    assert wb.active.title != dp.INCREMENTAL_CONFIG['index_sheet']
+    assert wb[dp.INCREMENTAL_CONFIG['index_sheet']].sheet_state == 'hidden'
+    assert len(dp.load_key_index(wb)) == other['added']
+
+
+def test_fingerprints_survive_int_to_float_column_change():
+    # 누적 내보내기에 새 행(두께 12.7)이 추가되면 두께 컬럼이 int64에서 float64로 바뀜
+    rows = {'시편배치': ['10000001A00', '10000002A00'], '외경': [508, 508], '두께': [12, 12],
+            'Heat No.': ['H00001', 'H00002'], 'C': [0.05, 0.07]}
+    before = pd.DataFrame(rows)
+    after = pd.DataFrame({col: values + [new] for (col, values), new in
+                          zip(rows.items(), ['10000003A00', 508, 12.7, 'H00003', 0.06])})
+    assert before['두께'].dtype == 'int64' and after['두께'].dtype == 'float64'
+
+    old = dp.input_fingerprints(before, dp.raw_key_frame(before))
+    new = dp.input_fingerprints(after, dp.raw_key_frame(after))
+    assert len(new) == 3
+    assert all(new[key] == value for key, value in old.items())
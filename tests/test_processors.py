@@ -0,0 +1,83 @@
+"""벡터화한 처리 함수(규칙 2~4)와 기존 루프 구현(*_reference)의 결과 비교"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processing as dp
+import generate_data
+
+REFERENCES = {
+    'component': dp.process_component_data_reference,
+    'tensile': dp.process_tensile_data_reference,
+    'impact': dp.process_impact_data_reference,
+}
+
+
+@pytest.fixture(scope='session')
+def edge_case_dir(tmp_path_factory):
+    """키가 빈 행, 없는 인장 방향/충격 Notch 위치, 문자 온도 값이 섞인 시험 결과 파일 폴더"""
+    out_dir = tmp_path_factory.mktemp('edge_cases')
+    rows = 300
+
+    component = generate_data.make_component_frame(rows)
+    component.loc[::40, '시편배치'] = np.nan
+
+    tensile = generate_data.make_tensile_frame(rows)
+    tensile.loc[::40, 'Heat No.'] = np.nan
+    tensile = tensile[tensile['시편 위치/방향'] != dp.TENSILE_DIRECTIONS[-1]]
+
+    impact = generate_data.make_impact_frame(rows)
+    impact.loc[::40, '시편배치'] = np.nan
+    impact = impact[impact['Notch 위치'] != dp.IMPACT_LOCATIONS[-1]].copy()
+    impact['온도(˚C)_1'] = impact['온도(˚C)_1'].astype(object)
+    impact.loc[impact.index[::7], '온도(˚C)_1'] = '상온'
+
+    generate_data.write_flat_workbook(component, os.path.join(out_dir, dp.FILENAME_CONFIG['component']))
+    generate_data.write_flat_workbook(tensile, os.path.join(out_dir, dp.FILENAME_CONFIG['tensile']))
+    generate_data.write_impact_workbook(impact, os.path.join(out_dir, dp.FILENAME_CONFIG['impact']))
+    return str(out_dir)
+
+
+def assert_same_as_reference(kind, raw_df):
+    # 처리 함수가 원본에 '시편배치_키' 컬럼을 추가하므로 각각 복사본을 전달
+    processed = dp.process_test_data(kind, raw_df.copy())
+    reference = REFERENCES[kind](raw_df.copy())
+    assert not processed.empty
+    # 값만 비교 (벡터화 구현은 메모리를 덜 쓰는 타입으로 바꿈)
+    pd.testing.assert_frame_equal(processed, reference, check_dtype=False, check_categorical=False,
+                                  check_index_type=False, check_column_type=False)
+
+
+@pytest.mark.parametrize('kind', dp.TEST_KINDS)
+def test_matches_reference(kind, data_dir):
+    raw_df = dp.read_test_data(kind, os.path.join(data_dir, dp.FILENAME_CONFIG[kind]))
+    assert_same_as_reference(kind, raw_df)
+
+
+@pytest.mark.parametrize('kind', dp.TEST_KINDS)
+def test_matches_reference_on_edge_cases(kind, edge_case_dir):
+    raw_df = dp.read_test_data(kind, os.path.join(edge_case_dir, dp.FILENAME_CONFIG[kind]))
+    if kind == 'impact':
+        # 문자 온도 값이 있으면 온도 컬럼이 숫자가 아니므로 행별 mode 경로를 사용
+        assert not pd.api.types.is_numeric_dtype(raw_df['온도(˚C)_1'])
+    assert_same_as_reference(kind, raw_df)
+
+
+def test_integer_energy_is_averaged_unlike_reference():
+    # 기존 구현은 np.int64 값을 숫자로 보지 않아 *_Avg가 None (의도한 변경, numeric_values_only 참고)
+    raw_df = pd.DataFrame({
+        '시편배치': ['10000001A00', '10000001A01'], '외경': [508.0, 508.0], '두께': [12.7, 12.7],
+        'Heat No.': ['H00001', 'H00001'], 'Notch 위치': ['Weld Line', 'HAZ'], '온도(˚C)_1': [-20, -20],
+        '에너지(J) SIZE 10보정_1': [100, 200], '에너지(J) SIZE 10보정_2': [110, 210],
+        '에너지(J) SIZE 10보정_3': [120, 220],
+    })
+    processed = dp.process_impact_data(raw_df.copy())
+    reference = dp.process_impact_data_reference(raw_df.copy())
+
+    assert processed[['Weld Line_Avg', 'HAZ_Avg']].iloc[0].tolist() == [110.0, 210.0]
+    assert reference[['Weld Line_Avg', 'HAZ_Avg']].iloc[0].isna().all()
+    avg_cols = [f'{loc}_Avg' for loc in dp.IMPACT_LOCATIONS]
+    pd.testing.assert_frame_equal(processed.drop(columns=avg_cols), reference.drop(columns=avg_cols),
+                                  check_dtype=False, check_index_type=False, check_column_type=False)
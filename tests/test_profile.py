@@ -0,0 +1,24 @@
+"""단계별 계측: 앞 단계에서 메모리를 많이 썼어도 각 단계의 메모리 증가량을 기록"""
+import time
+
+import numpy as np
+import pytest
+
+import data_processing as dp
+
+
+@pytest.mark.skipif(dp.current_memory_mb() is None, reason='현재 RSS를 읽을 수 없는 환경')
+def test_stage_memory_is_measured_per_stage():
+    profile = dp.PipelineProfile(trace_memory=False)
+    for name, size in [('large', 40_000_000), ('smaller', 20_000_000)]:
+        with profile.stage(name):
+            values = np.ones(size)
+            time.sleep(0.1)
+            del values
+    with profile.stage('idle'):
+        pass
+
+    large, smaller, idle = [record['peak_mb'] for record in profile.records]
+    # 두 번째 단계(약 150MB)는 첫 단계(약 300MB)보다 적게 써도 0이 아님
+    assert large > 200 and 100 < smaller < large
+    assert idle < 50
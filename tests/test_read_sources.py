@@ -0,0 +1,35 @@
+"""여러 파일(월별 내보내기) 읽기: 파일 간 중복 행은 한 번만 사용"""
+import openpyxl
+import pytest
+
+import data_processing as dp
+
+
+def write_component_file(path, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(dp.BASE_KEY_COLS + ['C'])
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def test_overlapping_row_is_dropped_even_when_dtypes_differ(tmp_path):
+    # 1월 파일의 외경은 정수(508), 2월 파일은 323.9가 섞여 실수(508.0)로 읽힘
+    jan = write_component_file(tmp_path / 'jan.xlsx', [['10000001A01', 508, 12.7, 'H00001', 0.05]])
+    feb = write_component_file(tmp_path / 'feb.xlsx', [['10000001A01', 508, 12.7, 'H00001', 0.05],
+                                                       ['10000002A01', 323.9, 7.9, 'H00002', 0.07]])
+    df = dp.read_test_sources('component', [jan, feb])
+    assert len(df) == 2
+
+    processed = dp.process_component_data(df)
+    # 키마다 행이 하나이므로 두 번째 성분 값(C_2)이 생기지 않음
+    assert 'C_2' not in processed.columns
+
+
+def test_same_rows_within_one_file_are_kept(tmp_path):
+    row = ['10000001A01', 508, 12.7, 'H00001', 0.05]
+    jan = write_component_file(tmp_path / 'jan.xlsx', [row, row])
+    feb = write_component_file(tmp_path / 'feb.xlsx', [row])
+    assert len(dp.read_test_sources('component', [jan, feb])) == 2